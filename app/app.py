@@ -1,4 +1,6 @@
 import reflex as rx
+from fastapi.responses import PlainTextResponse
+from app.pipeline.metrics import get_metrics
 from app.states.forecast_state import ForecastState
 from app.components.controls import control_panel_component
 from app.components.status_display import (
@@ -7,6 +9,9 @@ from app.components.status_display import (
 from app.components.forecast_chart import (
     forecast_chart_component,
 )
+from app.components.fleet_summary import (
+    fleet_summary_component,
+)
 
 
 def index() -> rx.Component:
@@ -22,6 +27,7 @@ def index() -> rx.Component:
             control_panel_component(),
             status_display_component(),
             forecast_chart_component(),
+            fleet_summary_component(),
             class_name="container mx-auto px-4 py-5 flex flex-col items-center",
         ),
         rx.el.footer(
@@ -41,4 +47,14 @@ app = rx.App(
         "https://cdnjs.cloudflare.com/ajax/libs/tailwindcss/2.2.19/tailwind.min.css"
     ],
 )
-app.add_page(index, title="Prévision EGT")
\ No newline at end of file
+app.add_page(index, title="Prévision EGT")
+
+
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        get_metrics().render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+app.api.add_api_route("/metrics", metrics)
\ No newline at end of file
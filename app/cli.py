@@ -0,0 +1,397 @@
+"""Headless batch forecasting, without starting the Reflex app.
+
+    python -m app.cli forecast WORKBOOKS/ --out FORECASTS/
+    python -m app.cli serve
+    python -m app.cli forecast WORKBOOKS/ --out FORECASTS/ --connect
+
+``serve`` keeps a warm process (pandas, xgboost and the caches already
+loaded) that later ``--connect`` invocations hand their batch to.
+Heavy modules are only imported once a command needs them.
+"""
+
+import argparse
+import os
+import secrets
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+WORKBOOK_SUFFIXES = (".xlsx", ".xls")
+DEFAULT_ADDRESS = os.environ.get(
+    "EGT_WARM_ADDRESS",
+    os.path.join(tempfile.gettempdir(), "egt-warm.sock"),
+)
+AUTHKEY_ENV = "EGT_WARM_AUTHKEY"
+
+
+def find_workbooks(directory: Path) -> list[Path]:
+    return sorted(
+        path
+        for path in Path(directory).iterdir()
+        if path.suffix.lower() in WORKBOOK_SUFFIXES
+        and not path.name.startswith("~$")
+    )
+
+
+def _summary(
+    path: Path, seconds: float, result=None, error=None
+):
+    if error is not None:
+        return {
+            "workbook": path.name,
+            "status": "error",
+            "seconds": seconds,
+            "error": f"{type(error).__name__}: {error}",
+        }
+    return {
+        "workbook": path.name,
+        "status": "ok",
+        "seconds": seconds,
+        "training_mode": result.training_mode,
+        "last_forecast": float(result.predictions[-1]),
+        "min_forecast": float(result.predictions.min()),
+        "cycles_to_limit": result.cycles_to_limit,
+        "limit_date": (
+            None
+            if result.limit_date is None
+            else result.limit_date.date().isoformat()
+        ),
+    }
+
+
+def forecast_batch(
+    paths: list[Path],
+    out_dir: Path,
+    options: dict,
+    workers: int = 1,
+    log=print,
+) -> list[dict]:
+    """Forecast each workbook and write ``<stem>_forecast.<format>``.
+
+    With several ``workers`` the workbooks run in the job executor's
+    worker processes; otherwise in this process.
+    """
+    from app.pipeline.chart_series import RISK_THRESHOLD
+    from app.pipeline.engine import (
+        ForecastRequest,
+        run_pipeline,
+    )
+    from app.pipeline.exports import write_export
+
+    fmt = options.get("format", "csv")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    requests = [
+        ForecastRequest(
+            Path(path),
+            options.get("n_lags", 30),
+            options.get("n_steps", 200),
+            options.get("strategy", "recursive"),
+            uncertainty=options.get("uncertainty", False),
+            limit=options.get("limit", RISK_THRESHOLD),
+            backend=options.get("backend"),
+        )
+        for path in paths
+    ]
+    if workers > 1:
+        from app.pipeline.jobs import JobExecutor
+
+        executor = JobExecutor(
+            max_workers=workers, max_queued=len(requests)
+        )
+        pending = [
+            (
+                request,
+                time.perf_counter(),
+                executor.submit(
+                    str(request.file_path),
+                    run_pipeline,
+                    request,
+                ),
+            )
+            for request in requests
+        ]
+        outcomes = []
+        for request, start, job in pending:
+            try:
+                outcomes.append(
+                    (request, job.result(), None)
+                )
+            except Exception as error:
+                outcomes.append((request, None, error))
+            outcomes[-1] += (time.perf_counter() - start,)
+    else:
+        outcomes = []
+        for request in requests:
+            start = time.perf_counter()
+            try:
+                result, error = run_pipeline(request), None
+            except Exception as exc:
+                result, error = None, exc
+            outcomes.append(
+                (
+                    request,
+                    result,
+                    error,
+                    time.perf_counter() - start,
+                )
+            )
+    summaries = []
+    for request, result, error, seconds in outcomes:
+        path = request.file_path
+        if result is not None:
+            try:
+                write_export(
+                    result.to_frame(),
+                    out_dir / f"{path.stem}_forecast.{fmt}",
+                    fmt,
+                )
+            except Exception as exc:
+                result, error = None, exc
+        summary = _summary(path, seconds, result, error)
+        summaries.append(summary)
+        if error is None:
+            log(
+                f"{path.name}: ok in {seconds:.2f}s, "
+                f"final margin {summary['last_forecast']:.2f} °C, "
+                + (
+                    f"limit in {summary['cycles_to_limit']:.0f} cycles"
+                    if summary["limit_date"]
+                    else f"limit not reached in {result.limit_horizon} cycles"
+                )
+            )
+        else:
+            log(f"{path.name}: {summary['error']}")
+    return summaries
+
+
+def _authkey() -> bytes:
+    """The warm worker key: ``EGT_WARM_AUTHKEY`` or a per-install one.
+
+    The generated key is kept in a file only the current user can read,
+    created atomically so concurrent first runs agree on it.
+    """
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode()
+    from app.pipeline.storage import cache_dir
+
+    path = cache_dir("warm") / "authkey"
+    if not path.exists():
+        # mkstemp creates the file with mode 0600.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "w") as out:
+                out.write(secrets.token_hex(32))
+            os.link(tmp_name, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_name)
+    return path.read_bytes()
+
+
+def _address(value: str):
+    host, sep, port = value.rpartition(":")
+    if sep and port.isdigit() and "/" not in value:
+        # Connections unpickle what they receive, so a TCP port must
+        # not be guarded by a key only readable on this machine.
+        if not os.environ.get(AUTHKEY_ENV):
+            raise SystemExit(
+                f"Refusing TCP address {value}: set {AUTHKEY_ENV} "
+                "to a shared secret on both ends."
+            )
+        return host or "127.0.0.1", int(port)
+    return value
+
+
+def serve(address: str) -> None:
+    """Answer batch requests from ``--connect`` clients until stopped."""
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Listener
+
+    address = _address(address)
+    if isinstance(address, str) and os.path.lexists(
+        address
+    ):
+        if not stat.S_ISSOCK(os.lstat(address).st_mode):
+            raise SystemExit(
+                f"{address} exists and is not a socket."
+            )
+        os.unlink(address)
+
+    # Warm up everything a forecast needs before the first request.
+    import app.pipeline.engine  # noqa: F401
+    from app.pipeline.backends import get_backend
+
+    backend = get_backend()
+    backend.builder(backend.params())()
+    with Listener(address, authkey=_authkey()) as listener:
+        print(f"Warm worker listening on {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                print("Rejected a client with a wrong key.")
+                continue
+            with conn:
+                try:
+                    message = conn.recv()
+                    if message[0] == "shutdown":
+                        conn.send(("done", []))
+                        break
+                    _, paths, out_dir, options, workers = (
+                        message
+                    )
+                    summaries = forecast_batch(
+                        [Path(p) for p in paths],
+                        Path(out_dir),
+                        options,
+                        workers,
+                        log=lambda line: conn.send(
+                            ("log", line)
+                        ),
+                    )
+                    conn.send(("done", summaries))
+                except Exception as exc:
+                    # A failed batch or a vanished client must not
+                    # take the warm worker down with it.
+                    error = f"{type(exc).__name__}: {exc}"
+                    print(f"Request failed: {error}")
+                    try:
+                        conn.send(("error", error))
+                    except (OSError, EOFError):
+                        pass
+
+
+def _send(
+    address: str, message: tuple
+) -> list[dict] | None:
+    """The worker's summaries, or None when the request failed."""
+    from multiprocessing.connection import Client
+
+    with Client(
+        _address(address), authkey=_authkey()
+    ) as conn:
+        conn.send(message)
+        while True:
+            kind, payload = conn.recv()
+            if kind == "done":
+                return payload
+            if kind == "error":
+                print(payload, file=sys.stderr)
+                return None
+            print(payload)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Batch EGT margin forecasting.",
+    )
+    commands = parser.add_subparsers(
+        dest="command", required=True
+    )
+    forecast = commands.add_parser(
+        "forecast",
+        help="Forecast every workbook of a directory.",
+    )
+    forecast.add_argument("directory", type=Path)
+    forecast.add_argument("--out", type=Path, required=True)
+    forecast.add_argument("--lags", type=int, default=30)
+    forecast.add_argument("--steps", type=int, default=200)
+    forecast.add_argument(
+        "--strategy",
+        choices=("recursive", "direct"),
+        default="recursive",
+    )
+    forecast.add_argument(
+        "--format",
+        choices=("csv", "xlsx", "parquet"),
+        default="csv",
+    )
+    forecast.add_argument(
+        "--uncertainty",
+        action="store_true",
+        help="Add P10/P90 bands from a bootstrap ensemble.",
+    )
+    forecast.add_argument(
+        "--limit",
+        type=float,
+        default=20.0,
+        help="EGT margin (°C) to count remaining cycles to.",
+    )
+    forecast.add_argument(
+        "--backend",
+        choices=("xgboost", "ridge"),
+        help="Model backend; defaults to XGBoost when installed.",
+    )
+    forecast.add_argument("--workers", type=int, default=1)
+    forecast.add_argument(
+        "--connect",
+        nargs="?",
+        const=DEFAULT_ADDRESS,
+        help="Hand the batch to a warm worker started with serve.",
+    )
+    server = commands.add_parser(
+        "serve", help="Keep a warm worker for --connect."
+    )
+    server.add_argument(
+        "--address", default=DEFAULT_ADDRESS
+    )
+    stop = commands.add_parser(
+        "stop", help="Stop a warm worker."
+    )
+    stop.add_argument("--address", default=DEFAULT_ADDRESS)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.address)
+        return 0
+    if args.command == "stop":
+        return (
+            0
+            if _send(args.address, ("shutdown",))
+            is not None
+            else 1
+        )
+    paths = find_workbooks(args.directory)
+    if not paths:
+        print(f"No workbook found in {args.directory}")
+        return 1
+    options = {
+        "n_lags": args.lags,
+        "n_steps": args.steps,
+        "strategy": args.strategy,
+        "format": args.format,
+        "uncertainty": args.uncertainty,
+        "limit": args.limit,
+        "backend": args.backend,
+    }
+    if args.connect:
+        summaries = _send(
+            args.connect,
+            (
+                "forecast",
+                [str(p.resolve()) for p in paths],
+                str(args.out.resolve()),
+                options,
+                args.workers,
+            ),
+        )
+        if summaries is None:
+            return 1
+    else:
+        summaries = forecast_batch(
+            paths, args.out, options, args.workers
+        )
+    failed = sum(s["status"] != "ok" for s in summaries)
+    print(
+        f"{len(summaries) - failed}/{len(summaries)} workbooks forecast."
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -8,12 +8,113 @@ from app.components.file_uploader import (
 def control_panel_component() -> rx.Component:
     return rx.el.div(
         file_uploader_component(),
-        rx.el.button(
-            "Lancer la prévision",
-            on_click=ForecastState.run_forecast,
-            is_disabled=ForecastState.is_processing
-            | (ForecastState.uploaded_file_name == ""),
-            class_name="mt-6 px-6 py-3 bg-indigo-600 text-white font-semibold rounded-lg shadow-md hover:bg-indigo-700 focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:ring-opacity-50 transition-colors duration-200 disabled:opacity-50 disabled:cursor-not-allowed",
+        rx.el.div(
+            rx.el.label(
+                "Stratégie de prévision",
+                html_for="forecast_strategy",
+                class_name="text-sm font-medium text-gray-700 mr-3",
+            ),
+            rx.el.select(
+                rx.el.option(
+                    "Récursive (pas à pas)",
+                    value="recursive",
+                ),
+                rx.el.option(
+                    "Directe multi-horizon",
+                    value="direct",
+                ),
+                id="forecast_strategy",
+                value=ForecastState.forecast_strategy,
+                on_change=ForecastState.set_forecast_strategy,
+                disabled=ForecastState.is_processing,
+                class_name="px-3 py-2 border border-gray-300 rounded-lg text-sm bg-white",
+            ),
+            class_name="flex items-center justify-center mt-6",
+        ),
+        rx.el.div(
+            rx.el.label(
+                "Modèle",
+                html_for="model_backend",
+                class_name="text-sm font-medium text-gray-700 mr-3",
+            ),
+            rx.el.select(
+                rx.foreach(
+                    ForecastState.model_backends,
+                    lambda backend: rx.el.option(
+                        backend["label"],
+                        value=backend["name"],
+                    ),
+                ),
+                id="model_backend",
+                value=ForecastState.model_backend,
+                on_change=ForecastState.set_model_backend,
+                disabled=ForecastState.is_processing,
+                class_name="px-3 py-2 border border-gray-300 rounded-lg text-sm bg-white",
+            ),
+            class_name="flex items-center justify-center mt-4",
+        ),
+        rx.el.div(
+            rx.el.label(
+                "Seuil de marge EGT (°C)",
+                html_for="margin_limit",
+                class_name="text-sm font-medium text-gray-700 mr-3",
+            ),
+            rx.el.input(
+                type="number",
+                step="0.5",
+                id="margin_limit",
+                default_value=ForecastState.margin_limit.to_string(),
+                on_blur=ForecastState.set_margin_limit,
+                disabled=ForecastState.is_processing,
+                class_name="w-24 px-3 py-2 border border-gray-300 rounded-lg text-sm bg-white",
+            ),
+            class_name="flex items-center justify-center mt-4",
+        ),
+        rx.el.label(
+            rx.el.input(
+                type="checkbox",
+                checked=ForecastState.fleet_mode,
+                on_change=ForecastState.set_fleet_mode,
+                disabled=ForecastState.is_processing,
+                class_name="mr-2",
+            ),
+            "Mode flotte (plusieurs moteurs par fichier ou plusieurs fichiers)",
+            class_name="flex items-center justify-center mt-4 text-sm text-gray-700",
+        ),
+        rx.el.label(
+            rx.el.input(
+                type="checkbox",
+                checked=ForecastState.uncertainty_mode,
+                on_change=ForecastState.set_uncertainty_mode,
+                disabled=ForecastState.is_processing
+                | (
+                    ForecastState.model_backend != "xgboost"
+                ),
+                class_name="mr-2",
+            ),
+            "Intervalles de prévision P10/P90 (ensemble bootstrap)",
+            class_name="flex items-center justify-center mt-2 text-sm text-gray-700",
+        ),
+        rx.el.div(
+            rx.el.button(
+                "Lancer la prévision",
+                on_click=ForecastState.start_forecast,
+                disabled=ForecastState.is_processing
+                | (ForecastState.uploaded_file_name == ""),
+                class_name="px-6 py-3 bg-indigo-600 text-white font-semibold rounded-lg shadow-md hover:bg-indigo-700 focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:ring-opacity-50 transition-colors duration-200 disabled:opacity-50 disabled:cursor-not-allowed",
+            ),
+            rx.el.button(
+                "Optimiser les paramètres",
+                on_click=ForecastState.run_tuning,
+                disabled=ForecastState.is_processing
+                | (ForecastState.uploaded_file_name == "")
+                | ForecastState.fleet_mode
+                | (
+                    ForecastState.model_backend != "xgboost"
+                ),
+                class_name="ml-3 px-6 py-3 bg-white text-indigo-700 font-semibold border border-indigo-300 rounded-lg shadow-md hover:bg-indigo-50 disabled:opacity-50 disabled:cursor-not-allowed",
+            ),
+            class_name="flex items-center justify-center mt-6",
         ),
         class_name="p-6 bg-white rounded-xl shadow-lg w-full max-w-2xl mx-auto mb-8",
     )
\ No newline at end of file
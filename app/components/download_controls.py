@@ -0,0 +1,50 @@
+import reflex as rx
+from app.states.forecast_state import ForecastState
+
+EXPORT_FORMAT_LABELS = {
+    "xlsx": "Excel (.xlsx)",
+    "csv": "CSV (.csv)",
+    "parquet": "Parquet (.parquet)",
+}
+
+
+def download_button(
+    label: str, on_click, disabled
+) -> rx.Component:
+    return rx.el.button(
+        rx.icon(tag="download", class_name="mr-2"),
+        label,
+        on_click=on_click,
+        disabled=disabled,
+        class_name="px-6 py-3 bg-green-600 text-white font-semibold rounded-lg shadow-md hover:bg-green-700 focus:outline-none focus:ring-2 focus:ring-green-500 focus:ring-opacity-50 transition-colors duration-200 disabled:opacity-50 disabled:cursor-not-allowed flex items-center justify-center",
+    )
+
+
+def download_controls_component(
+    label: str, *extra_buttons: rx.Component
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.select(
+            rx.foreach(
+                ForecastState.export_formats,
+                lambda fmt: rx.el.option(
+                    rx.match(
+                        fmt,
+                        *EXPORT_FORMAT_LABELS.items(),
+                        fmt,
+                    ),
+                    value=fmt,
+                ),
+            ),
+            value=ForecastState.export_format,
+            on_change=ForecastState.set_export_format,
+            class_name="mr-3 px-3 py-3 border border-gray-300 rounded-lg text-sm bg-white",
+        ),
+        download_button(
+            label,
+            ForecastState.download_forecast,
+            ~ForecastState.can_download,
+        ),
+        *extra_buttons,
+        class_name="mt-8 flex items-center justify-center gap-3 mx-auto",
+    )
\ No newline at end of file
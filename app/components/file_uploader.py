@@ -26,9 +26,12 @@ def file_uploader_component() -> rx.Component:
             ),
             rx.el.p(
                 rx.cond(
+                    ForecastState.uploaded_file_names.length()
+                    > 1,
+                    ForecastState.uploaded_file_names.join(
+                        ", "
+                    ),
                     ForecastState.uploaded_file_name,
-                    ForecastState.uploaded_file_name,
-                    "",
                 ),
                 class_name="text-sm text-gray-500 mt-2 text-center",
             ),
@@ -39,7 +42,7 @@ def file_uploader_component() -> rx.Component:
                 ],
                 "application/vnd.ms-excel": [".xls"],
             },
-            multiple=False,
+            multiple=True,
             on_drop=ForecastState.handle_upload(
                 rx.upload_files(upload_id="excel_uploader")
             ),
@@ -0,0 +1,102 @@
+import reflex as rx
+from app.states.forecast_state import ForecastState
+from app.components.download_controls import (
+    download_button,
+    download_controls_component,
+)
+
+FLEET_SUMMARY_COLUMNS = [
+    ("engine", "Moteur"),
+    ("source", "Fichier"),
+    ("rows", "Cycles"),
+    ("status", "Statut"),
+    ("training_mode", "Entraînement"),
+    ("seconds", "Durée (s)"),
+    ("rows_per_sec", "Cycles/s"),
+    ("last_forecast", "Marge finale (°C)"),
+    ("min_forecast", "Marge min. (°C)"),
+    ("cycles_to_limit", "Cycles avant seuil"),
+    ("limit_date", "Date du seuil"),
+]
+
+
+def fleet_summary_header(
+    key: str, label: str
+) -> rx.Component:
+    return rx.el.th(
+        label,
+        rx.cond(
+            ForecastState.fleet_sort_key == key,
+            rx.cond(
+                ForecastState.fleet_sort_desc, " ▼", " ▲"
+            ),
+            "",
+        ),
+        on_click=ForecastState.sort_fleet(key),
+        class_name="px-3 py-2 text-left text-xs font-semibold text-gray-600 uppercase cursor-pointer select-none hover:text-indigo-700",
+    )
+
+
+def fleet_summary_row(row: rx.Var) -> rx.Component:
+    return rx.el.tr(
+        *[
+            rx.el.td(
+                row[key],
+                class_name="px-3 py-2 text-sm text-gray-700 whitespace-nowrap",
+            )
+            for key, _ in FLEET_SUMMARY_COLUMNS
+        ],
+        class_name="border-t border-gray-100",
+    )
+
+
+def fleet_summary_component() -> rx.Component:
+    return rx.el.div(
+        rx.cond(
+            ForecastState.fleet_summary.length() > 0,
+            rx.el.div(
+                rx.el.h2(
+                    "Synthèse de la flotte",
+                    class_name="text-2xl font-semibold text-gray-800 mb-6 text-center",
+                ),
+                rx.el.div(
+                    rx.el.table(
+                        rx.el.thead(
+                            rx.el.tr(
+                                *[
+                                    fleet_summary_header(
+                                        key, label
+                                    )
+                                    for key, label in FLEET_SUMMARY_COLUMNS
+                                ],
+                                class_name="bg-gray-50",
+                            )
+                        ),
+                        rx.el.tbody(
+                            rx.foreach(
+                                ForecastState.fleet_summary,
+                                fleet_summary_row,
+                            )
+                        ),
+                        class_name="min-w-full",
+                    ),
+                    class_name="bg-white rounded-xl shadow-lg overflow-x-auto",
+                ),
+                download_controls_component(
+                    "Télécharger les prévisions de la flotte",
+                    download_button(
+                        "Télécharger le classement",
+                        ForecastState.download_ranking,
+                        (
+                            ForecastState.ranking_artifact_id
+                            == ""
+                        )
+                        | ForecastState.is_processing,
+                    ),
+                ),
+                class_name="w-full max-w-5xl mx-auto p-4",
+            ),
+            rx.el.div(),
+        ),
+        class_name="w-full",
+    )
\ No newline at end of file
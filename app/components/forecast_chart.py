@@ -1,5 +1,44 @@
 import reflex as rx
 from app.states.forecast_state import ForecastState
+from app.components.download_controls import (
+    download_controls_component,
+)
+
+
+def chart_zoom_controls() -> rx.Component:
+    return rx.el.div(
+        rx.el.label(
+            "Du",
+            class_name="text-sm text-gray-700 mr-2",
+        ),
+        rx.el.input(
+            type="date",
+            value=ForecastState.chart_start,
+            on_change=ForecastState.set_chart_start,
+            class_name="px-2 py-1 border border-gray-300 rounded-lg text-sm mr-4",
+        ),
+        rx.el.label(
+            "au",
+            class_name="text-sm text-gray-700 mr-2",
+        ),
+        rx.el.input(
+            type="date",
+            value=ForecastState.chart_end,
+            on_change=ForecastState.set_chart_end,
+            class_name="px-2 py-1 border border-gray-300 rounded-lg text-sm mr-4",
+        ),
+        rx.el.button(
+            "Zoomer",
+            on_click=ForecastState.zoom_chart,
+            class_name="px-3 py-1 bg-indigo-600 text-white text-sm rounded-lg mr-2 hover:bg-indigo-700",
+        ),
+        rx.el.button(
+            "Vue complète",
+            on_click=ForecastState.reset_chart_zoom,
+            class_name="px-3 py-1 bg-gray-200 text-gray-800 text-sm rounded-lg hover:bg-gray-300",
+        ),
+        class_name="flex items-center justify-center mb-4",
+    )
 
 
 def forecast_chart_component() -> rx.Component:
@@ -15,6 +54,15 @@ def forecast_chart_component() -> rx.Component:
                     "Prévision de la Marge EGT",
                     class_name="text-2xl font-semibold text-gray-800 mb-6 text-center",
                 ),
+                rx.cond(
+                    ForecastState.limit_summary != "",
+                    rx.el.p(
+                        ForecastState.limit_summary,
+                        class_name="mb-4 text-center text-sm font-medium text-orange-700",
+                    ),
+                    rx.el.div(),
+                ),
+                chart_zoom_controls(),
                 rx.recharts.line_chart(
                     rx.recharts.cartesian_grid(
                         stroke_dasharray="3 3",
@@ -34,24 +82,57 @@ def forecast_chart_component() -> rx.Component:
                     rx.recharts.legend(
                         payload=[
                             {
-                                "value": "Prévision EGT",
+                                "value": "Historique EGT",
+                                "type": "line",
+                                "color": "#9ca3af",
+                            },
+                            {
+                                "value": ForecastState.forecast_series_name,
                                 "type": "line",
                                 "color": "#4f46e5",
-                            }
+                            },
                         ]
                     ),
                     rx.recharts.line(
-                        data_key="EGT Margin Forecast (XGBoost)",
+                        data_key="EGT Margin",
+                        stroke="#9ca3af",
+                        dot=False,
+                        type="linear",
+                        name="Historique EGT",
+                        is_animation_active=False,
+                    ),
+                    rx.recharts.line(
+                        data_key="EGT Margin Forecast",
                         stroke="#4f46e5",
                         dot=False,
                         type="monotone",
-                        name="Prévision EGT",
+                        name=ForecastState.forecast_series_name,
+                    ),
+                    rx.recharts.line(
+                        data_key="EGT Margin P10",
+                        stroke="#a5b4fc",
+                        stroke_dasharray="4 4",
+                        dot=False,
+                        type="monotone",
+                        name="P10",
+                    ),
+                    rx.recharts.line(
+                        data_key="EGT Margin P90",
+                        stroke="#a5b4fc",
+                        stroke_dasharray="4 4",
+                        dot=False,
+                        type="monotone",
+                        name="P90",
                     ),
                     rx.recharts.reference_area(
                         y1=0,
-                        y2=20,
+                        # Typed as int by Reflex only; the value stays
+                        # the float limit on the client.
+                        y2=ForecastState.margin_limit.to(
+                            int
+                        ),
                         label=rx.recharts.label(
-                            value="Zone à Risque (< 20°C)",
+                            value=ForecastState.risk_zone_label,
                             position="insideTopLeft",
                             fill="#ef4444",
                             font_size="10px",
@@ -70,14 +151,8 @@ def forecast_chart_component() -> rx.Component:
                     },
                     class_name="bg-white p-6 rounded-xl shadow-lg",
                 ),
-                rx.el.button(
-                    rx.icon(
-                        tag="download", class_name="mr-2"
-                    ),
-                    "Télécharger les prévisions en Excel",
-                    on_click=ForecastState.download_excel,
-                    is_disabled=~ForecastState.can_download,
-                    class_name="mt-8 px-6 py-3 bg-green-600 text-white font-semibold rounded-lg shadow-md hover:bg-green-700 focus:outline-none focus:ring-2 focus:ring-green-500 focus:ring-opacity-50 transition-colors duration-200 disabled:opacity-50 disabled:cursor-not-allowed flex items-center justify-center mx-auto",
+                download_controls_component(
+                    "Télécharger les prévisions"
                 ),
                 class_name="w-full max-w-4xl mx-auto p-4",
             ),
@@ -2,19 +2,113 @@ import reflex as rx
 from app.states.forecast_state import ForecastState
 
 
+def stage_timing_row(row: rx.Var) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            row["stage"], class_name="px-2 py-1 text-left"
+        ),
+        rx.el.td(
+            row["seconds"],
+            class_name="px-2 py-1 text-right",
+        ),
+        rx.el.td(
+            row["rows"], class_name="px-2 py-1 text-right"
+        ),
+        rx.el.td(
+            row["memory"], class_name="px-2 py-1 text-right"
+        ),
+        class_name="border-t border-gray-100",
+    )
+
+
+def stage_timings_component() -> rx.Component:
+    return rx.cond(
+        ForecastState.stage_timings.length() > 0,
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.el.th(
+                        "Étape",
+                        class_name="px-2 py-1 text-left",
+                    ),
+                    rx.el.th(
+                        "Durée",
+                        class_name="px-2 py-1 text-right",
+                    ),
+                    rx.el.th(
+                        "Lignes",
+                        class_name="px-2 py-1 text-right",
+                    ),
+                    rx.el.th(
+                        "Mémoire max.",
+                        class_name="px-2 py-1 text-right",
+                    ),
+                    class_name="text-gray-600",
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(
+                    ForecastState.stage_timings,
+                    stage_timing_row,
+                )
+            ),
+            class_name="mx-auto mb-4 text-xs text-gray-700 bg-white rounded-lg shadow-sm",
+        ),
+        rx.el.div(),
+    )
+
+
+def progress_bar_component() -> rx.Component:
+    return rx.cond(
+        ForecastState.progress_percent >= 0,
+        rx.el.div(
+            rx.el.div(
+                rx.el.div(
+                    class_name="h-2 bg-indigo-600 rounded-full transition-all duration-500",
+                    style={
+                        "width": f"{ForecastState.progress_percent}%"
+                    },
+                ),
+                class_name="w-full h-2 bg-indigo-100 rounded-full overflow-hidden",
+            ),
+            rx.el.p(
+                ForecastState.progress_label,
+                class_name="mt-1 text-xs text-indigo-700",
+            ),
+            class_name="mt-3",
+        ),
+        rx.el.div(),
+    )
+
+
 def status_display_component() -> rx.Component:
     return rx.el.div(
         rx.cond(
             ForecastState.is_processing,
             rx.el.div(
-                rx.spinner(
-                    class_name="h-5 w-5 text-indigo-600"
-                ),
-                rx.el.p(
-                    ForecastState.status_message,
-                    class_name="ml-3 text-indigo-700 font-medium",
+                rx.el.div(
+                    rx.spinner(
+                        class_name="h-5 w-5 text-indigo-600"
+                    ),
+                    rx.el.p(
+                        ForecastState.status_message,
+                        class_name="ml-3 text-indigo-700 font-medium",
+                    ),
+                    rx.el.button(
+                        "Annuler",
+                        on_click=ForecastState.cancel_forecast,
+                        disabled=(
+                            ForecastState.job_id == ""
+                        )
+                        & (
+                            ForecastState.fleet_run_id == ""
+                        ),
+                        class_name="ml-4 px-3 py-1 bg-white text-red-600 border border-red-300 rounded-md hover:bg-red-50 disabled:opacity-50 disabled:cursor-not-allowed",
+                    ),
+                    class_name="flex items-center justify-center",
                 ),
-                class_name="flex items-center justify-center p-4 bg-indigo-50 rounded-lg text-sm mb-4",
+                progress_bar_component(),
+                class_name="p-4 bg-indigo-50 rounded-lg text-sm mb-4",
             ),
             rx.el.div(
                 rx.cond(
@@ -48,5 +142,6 @@ def status_display_component() -> rx.Component:
             ),
             rx.el.div(),
         ),
+        stage_timings_component(),
         class_name="w-full max-w-2xl mx-auto text-center",
     )
\ No newline at end of file
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from app.pipeline.parse_cache import PYARROW_AVAILABLE
+from app.pipeline.storage import (
+    atomic_write,
+    cache_dir,
+    evict_lru,
+    touch,
+)
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    from pyarrow import feather
+
+ARTIFACT_TTL_SECONDS = float(
+    os.environ.get("EGT_ARTIFACT_TTL_SECONDS", 24 * 3600)
+)
+ARTIFACT_MEMORY_BYTES = int(
+    os.environ.get(
+        "EGT_ARTIFACT_MEMORY_BYTES", 256 * 1024**2
+    )
+)
+ARTIFACT_MAX_BYTES = int(
+    os.environ.get("EGT_ARTIFACT_MAX_BYTES", 2 * 1024**3)
+)
+ARTIFACT_SUFFIX = ".arrow" if PYARROW_AVAILABLE else ".pkl"
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class ArtifactStore:
+    """Forecast result frames shared by every session of the server.
+
+    Each frame is written once to a columnar file and referenced by an
+    opaque id; the most recently used frames also stay in memory up to
+    ``memory_budget`` bytes. Files not read for ``ttl_seconds`` are
+    deleted by ``collect``.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        ttl_seconds: float = ARTIFACT_TTL_SECONDS,
+        memory_budget: int = ARTIFACT_MEMORY_BYTES,
+        max_bytes: int = ARTIFACT_MAX_BYTES,
+    ):
+        self.directory = directory or cache_dir("artifacts")
+        self.ttl_seconds = ttl_seconds
+        self.memory_budget = memory_budget
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict[
+            str, tuple[pd.DataFrame, int]
+        ] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, artifact_id: str) -> Path:
+        if not artifact_id.isalnum():
+            raise KeyError(artifact_id)
+        return (
+            self.directory
+            / f"{artifact_id}{ARTIFACT_SUFFIX}"
+        )
+
+    def _remember(
+        self, artifact_id: str, df: pd.DataFrame
+    ) -> None:
+        size = _frame_bytes(df)
+        with self._lock:
+            self._forget(artifact_id)
+            if size > self.memory_budget:
+                return
+            self._memory[artifact_id] = (df, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_budget:
+                _, (_, evicted) = self._memory.popitem(
+                    last=False
+                )
+                self._memory_bytes -= evicted
+
+    def _forget(self, artifact_id: str) -> None:
+        entry = self._memory.pop(artifact_id, None)
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+
+    def put(self, df: pd.DataFrame) -> str:
+        artifact_id = uuid.uuid4().hex
+        if PYARROW_AVAILABLE:
+            table = pa.Table.from_pandas(
+                df, preserve_index=False
+            )
+            write = lambda tmp: feather.write_feather(
+                table, tmp, compression="uncompressed"
+            )
+        else:
+            write = df.to_pickle
+        atomic_write(self._path(artifact_id), write)
+        self._remember(artifact_id, df)
+        self.collect()
+        return artifact_id
+
+    def __contains__(self, artifact_id: str) -> bool:
+        return bool(artifact_id) and (
+            self._path(artifact_id).exists()
+        )
+
+    def get(self, artifact_id: str) -> pd.DataFrame | None:
+        """The stored frame, or None once it has expired."""
+        if not artifact_id:
+            return None
+        path = self._path(artifact_id)
+        with self._lock:
+            entry = self._memory.get(artifact_id)
+            if entry is not None:
+                self._memory.move_to_end(artifact_id)
+        if entry is not None:
+            touch(path)
+            return entry[0]
+        try:
+            if PYARROW_AVAILABLE:
+                df = feather.read_table(
+                    path, memory_map=True
+                ).to_pandas()
+            else:
+                df = pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        touch(path)
+        self._remember(artifact_id, df)
+        return df
+
+    def discard(self, artifact_id: str) -> None:
+        if not artifact_id:
+            return
+        with self._lock:
+            self._forget(artifact_id)
+        self._path(artifact_id).unlink(missing_ok=True)
+
+    def collect(self) -> int:
+        """Delete expired artifacts and keep the directory in budget."""
+        cutoff = time.time() - self.ttl_seconds
+        removed = []
+        for path in self.directory.glob(
+            f"*{ARTIFACT_SUFFIX}"
+        ):
+            try:
+                expired = path.stat().st_mtime < cutoff
+            except FileNotFoundError:
+                continue
+            if expired:
+                path.unlink(missing_ok=True)
+                removed.append(path)
+        removed += evict_lru(
+            self.directory,
+            self.max_bytes,
+            f"*{ARTIFACT_SUFFIX}",
+        )
+        with self._lock:
+            for path in removed:
+                self._forget(path.stem)
+        return len(removed)
+
+
+_default_store: ArtifactStore | None = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = ArtifactStore()
+    return _default_store
\ No newline at end of file
@@ -0,0 +1,236 @@
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from app.pipeline.incremental import fit_with_history
+from app.pipeline.model import (
+    MODEL_PARAMS,
+    XGBOOST_AVAILABLE,
+    make_model,
+)
+from app.pipeline.model_registry import (
+    config_key,
+    get_model_registry,
+    model_key,
+)
+from app.pipeline.progress import boosting_callback
+from app.pipeline.tree_eval import TreeEnsemble
+
+RIDGE_ALPHA = float(os.environ.get("EGT_RIDGE_ALPHA", 1.0))
+
+
+class RidgeAR:
+    """Ridge-regularised linear autoregression on the lag matrix.
+
+    Uses the same EGT lags, vibration and CSN features as the boosted
+    model and is solved in closed form on standardised features. Missing
+    readings are replaced by their training mean.
+    """
+
+    def __init__(self, alpha: float = RIDGE_ALPHA):
+        self.alpha = alpha
+        self.coef_: np.ndarray | None = None
+        self.intercept_ = 0.0
+        self.fill_: np.ndarray | None = None
+
+    def fit(
+        self, X: np.ndarray, y: np.ndarray
+    ) -> "RidgeAR":
+        X = np.asarray(X, np.float64)
+        y = np.asarray(y, np.float64)
+        mean = np.nan_to_num(np.nanmean(X, axis=0))
+        X = np.where(np.isnan(X), mean, X)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        Z = (X - mean) / scale
+        y_mean = y.mean()
+        gram = Z.T @ Z
+        gram[np.diag_indices_from(gram)] += self.alpha
+        coef = np.linalg.solve(gram, Z.T @ (y - y_mean))
+        # Fold the standardisation into the weights so predicting is
+        # one dot product on raw features.
+        self.coef_ = (coef / scale).astype(np.float32)
+        self.intercept_ = float(
+            y_mean - mean @ (coef / scale)
+        )
+        self.fill_ = mean.astype(np.float32)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        missing = np.isnan(X)
+        if missing.any():
+            X = np.where(missing, self.fill_, X)
+        return X @ self.coef_ + np.float32(self.intercept_)
+
+
+class ModelBackend(ABC):
+    """How the one-step margin model is built, trained and evaluated."""
+
+    name = ""
+    label = ""
+    # Model name in exported columns and chart legends.
+    short_label = ""
+    # Boosted backends keep models in the registry, continue training
+    # on appended cycles, and support the bootstrap ensemble and tuning.
+    boosted = False
+
+    @abstractmethod
+    def params(self, overrides: dict | None = None) -> dict:
+        """Model parameters with ``overrides`` applied."""
+
+    @abstractmethod
+    def builder(self, params: dict, progress=None):
+        """A ``make_model(**kwargs)`` callable for ``params``."""
+
+    def fit_recursive(
+        self,
+        df,
+        data_key: str,
+        lag_matrix,
+        n_lags: int,
+        params: dict,
+        progress=None,
+    ):
+        """The trained one-step model and its training mode."""
+        model = self.builder(params, progress)()
+        model.fit(lag_matrix.X, lag_matrix.y)
+        return model, "full"
+
+    def predictor(self, model):
+        return model.predict
+
+    def member_predictor(self, models: list):
+        """``predict(rows, active)`` scoring row ``i`` with model ``active[i]``."""
+
+        def predict(rows, active):
+            return np.array(
+                [
+                    models[member].predict(row[None, :])[0]
+                    for member, row in zip(active, rows)
+                ]
+            )
+
+        return predict
+
+
+class XGBoostBackend(ModelBackend):
+    name = "xgboost"
+    label = "XGBoost (détaillé)"
+    short_label = "XGBoost"
+    boosted = True
+
+    def params(self, overrides: dict | None = None) -> dict:
+        return {**MODEL_PARAMS, **(overrides or {})}
+
+    def builder(self, params: dict, progress=None):
+        def build_model(**kwargs):
+            model_params = {**params, **kwargs}
+            if progress is not None:
+                # Models loaded from the registry never train, so
+                # rounds only count towards the total once boosting
+                # starts.
+                model_params["callbacks"] = [
+                    boosting_callback(
+                        progress,
+                        model_params["n_estimators"],
+                    )
+                ]
+            return make_model(**model_params)
+
+        return build_model
+
+    def fit_recursive(
+        self,
+        df,
+        data_key: str,
+        lag_matrix,
+        n_lags: int,
+        params: dict,
+        progress=None,
+    ):
+        features = {
+            "n_lags": n_lags,
+            "strategy": "recursive",
+        }
+        return fit_with_history(
+            get_model_registry(),
+            model_key(data_key, features, params),
+            config_key(features, params),
+            df,
+            n_lags,
+            self.builder(params, progress),
+            lambda: (lag_matrix.X, lag_matrix.y),
+        )
+
+    def predictor(self, model):
+        return TreeEnsemble.from_model(model).predict
+
+    def member_predictor(self, models: list):
+        return TreeEnsemble.stack(
+            [TreeEnsemble.from_model(m) for m in models]
+        ).predict_members
+
+
+class RidgeBackend(ModelBackend):
+    name = "ridge"
+    label = "Ridge autorégressif (rapide)"
+    short_label = "Ridge"
+
+    def params(self, overrides: dict | None = None) -> dict:
+        # Boosting parameters and thread counts do not apply.
+        return {"alpha": RIDGE_ALPHA}
+
+    def builder(self, params: dict, progress=None):
+        return lambda **kwargs: RidgeAR(params["alpha"])
+
+    def member_predictor(self, models: list):
+        coefs = np.stack([m.coef_ for m in models])
+        intercepts = np.array(
+            [m.intercept_ for m in models], np.float32
+        )
+        fills = np.stack([m.fill_ for m in models])
+
+        def predict(rows, active):
+            missing = np.isnan(rows)
+            if missing.any():
+                rows = np.where(
+                    missing, fills[active], rows
+                )
+            return (
+                np.einsum("ij,ij->i", rows, coefs[active])
+                + intercepts[active]
+            )
+
+        return predict
+
+
+BACKENDS: dict[str, ModelBackend] = {
+    backend.name: backend
+    for backend in (XGBoostBackend(), RidgeBackend())
+}
+DEFAULT_BACKEND = os.environ.get(
+    "EGT_MODEL_BACKEND",
+    "xgboost" if XGBOOST_AVAILABLE else "ridge",
+)
+
+
+def available_backends() -> list[str]:
+    return [
+        name
+        for name in BACKENDS
+        if name != "xgboost" or XGBOOST_AVAILABLE
+    ]
+
+
+def get_backend(name: str | None = None) -> ModelBackend:
+    name = name or DEFAULT_BACKEND
+    if name not in available_backends():
+        raise ValueError(
+            f"Modèle indisponible : {name}. Choix possibles : "
+            + ", ".join(available_backends())
+        )
+    return BACKENDS[name]
\ No newline at end of file
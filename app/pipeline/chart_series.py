@@ -0,0 +1,172 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.features import TARGET_COLUMN
+from app.pipeline.ingest import load_flight_log
+
+HISTORY_KEY = TARGET_COLUMN
+FORECAST_KEY = "EGT Margin Forecast"
+LOWER_KEY = "EGT Margin P10"
+UPPER_KEY = "EGT Margin P90"
+RISK_THRESHOLD = 20.0
+CHART_POINT_BUDGET = 1500
+
+
+def forecast_columns(model: str) -> dict[str, str]:
+    """Exported column name of each forecast key, naming ``model``."""
+    return {
+        key: f"{key} ({model})"
+        for key in (FORECAST_KEY, LOWER_KEY, UPPER_KEY)
+    }
+
+
+def lttb_indices(
+    x: np.ndarray, y: np.ndarray, n_out: int
+) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets selection of ``n_out`` points."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.unique(
+        np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    )
+    bounds = np.append(edges, n)
+    sizes = np.diff(bounds)
+    # Mean of each bucket, the last "bucket" being the final point.
+    mean_x = np.add.reduceat(x, bounds[:-1]) / sizes
+    mean_y = np.add.reduceat(y, bounds[:-1]) / sizes
+    selected = np.empty(len(edges) + 1, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(len(edges) - 1):
+        lo, hi = bounds[i], bounds[i + 1]
+        area = np.abs(
+            (x[a] - mean_x[i + 1]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (mean_y[i + 1] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def crossing_indices(
+    y: np.ndarray, threshold: float = RISK_THRESHOLD
+) -> np.ndarray:
+    """Both points around every crossing of ``threshold``."""
+    below = y < threshold
+    changes = np.flatnonzero(below[1:] != below[:-1])
+    return np.union1d(changes, changes + 1)
+
+
+def decimate(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_out: int,
+    threshold: float = RISK_THRESHOLD,
+) -> np.ndarray:
+    """LTTB indices plus the points that cross the risk threshold."""
+    if n_out >= len(x):
+        return np.arange(len(x))
+    crossings = crossing_indices(y, threshold)
+    if len(crossings) > n_out // 2:
+        crossings = crossings[
+            np.linspace(
+                0, len(crossings) - 1, n_out // 2
+            ).astype(np.int64)
+        ]
+    return np.union1d(
+        lttb_indices(x, y, n_out - len(crossings)),
+        crossings,
+    )
+
+
+def _points(
+    series: pd.Series,
+    key: str,
+    n_out: int,
+    extra: pd.DataFrame | None = None,
+    threshold: float = RISK_THRESHOLD,
+) -> list[dict[str, str | float]]:
+    """Decimated rows of ``series``; ``extra`` columns ride along."""
+    series = series.dropna()
+    if series.empty or n_out <= 0:
+        return []
+    x = series.index.asi8.astype(np.float64)
+    y = series.to_numpy(dtype=np.float64)
+    keep = decimate(x, y, n_out, threshold)
+    columns = {key: np.round(y[keep], 2).tolist()}
+    if extra is not None:
+        rows = extra.reindex(series.index[keep])
+        for name in rows.columns:
+            columns[name] = np.round(
+                rows[name].to_numpy(dtype=np.float64), 2
+            ).tolist()
+    dates = series.index[keep].strftime("%Y-%m-%d")
+    return [
+        {"date": date, **dict(zip(columns, values))}
+        for date, *values in zip(dates, *columns.values())
+    ]
+
+
+def build_chart_series(
+    history: pd.Series | None,
+    forecast: pd.Series,
+    budget: int = CHART_POINT_BUDGET,
+    start: str | None = None,
+    end: str | None = None,
+    bands: pd.DataFrame | None = None,
+    threshold: float = RISK_THRESHOLD,
+) -> list[dict[str, str | float]]:
+    """Chart rows for the observed history followed by the forecast.
+
+    Both series are limited to ``[start, end]`` and decimated so the
+    payload stays within ``budget`` points whatever the history length,
+    keeping the points around each crossing of ``threshold``.
+    ``bands`` columns, indexed like the forecast, are kept on the
+    forecast points that survive decimation.
+    """
+    window = slice(start or None, end or None)
+    forecast = forecast.sort_index().loc[window]
+    if history is None:
+        history = forecast.iloc[:0]
+    history = history.sort_index().loc[window]
+    n_forecast = min(
+        len(forecast),
+        max(budget // 4, budget - len(history)),
+    )
+    return _points(
+        history,
+        HISTORY_KEY,
+        budget - n_forecast,
+        threshold=threshold,
+    ) + _points(
+        forecast, FORECAST_KEY, n_forecast, bands, threshold
+    )
+
+
+def reload_chart_series(
+    file_path: Path,
+    forecast: pd.Series,
+    budget: int = CHART_POINT_BUDGET,
+    start: str | None = None,
+    end: str | None = None,
+    bands: pd.DataFrame | None = None,
+    threshold: float = RISK_THRESHOLD,
+) -> list[dict[str, str | float]]:
+    """Re-decimate a zoomed window from the parse-cached history."""
+    try:
+        history = load_flight_log(file_path)[TARGET_COLUMN]
+    except FileNotFoundError:
+        history = None
+    return build_chart_series(
+        history,
+        forecast,
+        budget,
+        start,
+        end,
+        bands,
+        threshold,
+    )
\ No newline at end of file
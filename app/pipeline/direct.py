@@ -0,0 +1,138 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.features import TARGET_COLUMN, LagMatrix
+from app.pipeline.model_registry import get_model_registry
+from app.pipeline.tree_eval import TreeEnsemble
+
+DIRECT_ANCHORS = 8
+
+
+def horizon_anchors(
+    n_steps: int, n_anchors: int = DIRECT_ANCHORS
+) -> np.ndarray:
+    """Horizons that get their own model, denser near the present."""
+    return np.unique(
+        np.round(
+            np.geomspace(
+                1, n_steps, min(n_anchors, n_steps)
+            )
+        ).astype(np.int64)
+    )
+
+
+def direct_training_set(
+    egt: np.ndarray, lag_matrix: LagMatrix, horizon: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rows of the lag matrix paired with the EGT ``horizon - 1`` cycles on.
+
+    Horizon 1 is the one-step target the recursive model learns.
+    """
+    target_positions = lag_matrix.positions + horizon - 1
+    in_range = target_positions < len(egt)
+    y = egt[target_positions[in_range]]
+    known = ~np.isnan(y)
+    return (
+        lag_matrix.X[in_range][known],
+        y[known].astype(np.float32),
+    )
+
+
+class DirectForecaster:
+    """One model per anchor horizon, predicted together in one call.
+
+    Horizons between anchors are linearly interpolated, so every step
+    of the curve comes from the last observed row rather than from
+    earlier predictions. Boosted models are stacked into one
+    ``TreeEnsemble``; pass ``stack=False`` for models that are not
+    XGBoost boosters.
+    """
+
+    def __init__(
+        self,
+        horizons: np.ndarray,
+        models: list,
+        stack: bool = True,
+    ):
+        self.horizons = horizons
+        self.models = models
+        self._ensemble = (
+            TreeEnsemble.stack(
+                [TreeEnsemble.from_model(m) for m in models]
+            )
+            if stack
+            else None
+        )
+
+    @classmethod
+    def fit(
+        cls,
+        make_model,
+        df: pd.DataFrame,
+        lag_matrix: LagMatrix,
+        n_steps: int,
+        max_workers: int | None = None,
+        cache_key: str | None = None,
+        stack: bool = True,
+    ) -> "DirectForecaster":
+        egt = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+        reach = (
+            len(egt) - lag_matrix.positions[0]
+            if len(lag_matrix)
+            else 0
+        )
+        horizons = horizon_anchors(n_steps)
+        horizons = horizons[horizons <= reach]
+        if not len(horizons):
+            raise ValueError(
+                "Not enough history for a direct forecast."
+            )
+        workers = max_workers or min(
+            len(horizons), os.cpu_count() or 1
+        )
+        threads_per_model = max(
+            1, (os.cpu_count() or 1) // workers
+        )
+
+        registry = get_model_registry()
+
+        def fit_one(horizon):
+            return registry.fit(
+                cache_key and f"{cache_key}-h{horizon}",
+                lambda: make_model(
+                    n_jobs=threads_per_model
+                ),
+                lambda: direct_training_set(
+                    egt, lag_matrix, horizon
+                ),
+            )
+
+        with ThreadPoolExecutor(workers) as pool:
+            models = list(pool.map(fit_one, horizons))
+        return cls(horizons, models, stack)
+
+    def predict(
+        self, seed: np.ndarray, n_steps: int
+    ) -> np.ndarray:
+        """Curves of ``n_steps`` cycles from each ``seed`` row.
+
+        A seed is the feature row of the first forecast cycle, as
+        built by ``forecast_seed``.
+        """
+        seed = np.atleast_2d(np.asarray(seed, np.float32))
+        if self._ensemble is not None:
+            anchors = self._ensemble.predict(seed)
+        else:
+            anchors = np.column_stack(
+                [m.predict(seed) for m in self.models]
+            )
+        steps = np.arange(1, n_steps + 1)
+        return np.vstack(
+            [
+                np.interp(steps, self.horizons, row)
+                for row in anchors
+            ]
+        ).astype(np.float32)
\ No newline at end of file
@@ -0,0 +1,358 @@
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.chart_series import (
+    CHART_POINT_BUDGET,
+    FORECAST_KEY,
+    LOWER_KEY,
+    RISK_THRESHOLD,
+    UPPER_KEY,
+    build_chart_series,
+    forecast_columns,
+)
+from app.pipeline.backends import (
+    DEFAULT_BACKEND,
+    get_backend,
+)
+from app.pipeline.direct import DirectForecaster
+from app.pipeline.features import (
+    TARGET_COLUMN,
+    build_lag_matrix,
+    forecast_seed,
+)
+from app.pipeline.ingest import load_flight_log
+from app.pipeline.metrics import Span, SpanRecorder
+from app.pipeline.model import MODEL_PARAMS
+from app.pipeline.model_registry import model_key
+from app.pipeline.parse_cache import (
+    file_digest,
+    remember_digest,
+)
+from app.pipeline.progress import as_reporter
+from app.pipeline.recursive import (
+    cycles_to_limit,
+    recursive_forecast,
+)
+from app.pipeline.tuning import get_tuning_store
+from app.pipeline.uncertainty import (
+    ENSEMBLE_SIZE,
+    BootstrapEnsemble,
+    prediction_bands,
+)
+
+# How far past the forecast horizon to look for the limit crossing.
+LIMIT_MAX_CYCLES = int(
+    os.environ.get("EGT_LIMIT_MAX_CYCLES", 2000)
+)
+
+
+class InsufficientDataError(ValueError):
+    pass
+
+
+@dataclass
+class ForecastRequest:
+    file_path: Path
+    n_lags: int = 30
+    n_steps: int = 200
+    strategy: str = "recursive"
+    chart_points: int = CHART_POINT_BUDGET
+    uncertainty: bool = False
+    engine: str | None = None
+    use_tuned: bool = True
+    limit: float = RISK_THRESHOLD
+    max_cycles: int = LIMIT_MAX_CYCLES
+    backend: str = DEFAULT_BACKEND
+    # sha256 of the workbook when already known, e.g. from its upload.
+    digest: str | None = None
+
+
+@dataclass
+class ForecastResult:
+    dates: pd.DatetimeIndex
+    predictions: np.ndarray
+    training_mode: str
+    chart_data: list[dict[str, str | float]] = field(
+        default_factory=list
+    )
+    spans: list[Span] = field(default_factory=list)
+    tuned: bool = False
+    # P10 and P90 rows when an uncertainty ensemble was run.
+    bands: np.ndarray | None = None
+    # Cycles until the margin reaches the limit (inf if not within
+    # ``limit_horizon`` cycles), None when no limit was asked for.
+    cycles_to_limit: float | None = None
+    limit_horizon: int = 0
+    backend: str = DEFAULT_BACKEND
+
+    @property
+    def limit_date(self) -> pd.Timestamp | None:
+        if self.cycles_to_limit is None or np.isinf(
+            self.cycles_to_limit
+        ):
+            return None
+        return self.dates[0] + pd.Timedelta(
+            days=int(self.cycles_to_limit) - 1
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """The table users download: dates, forecast and any bands.
+
+        Columns name the model that produced them.
+        """
+        frame = pd.DataFrame(
+            {
+                "Date": self.dates,
+                FORECAST_KEY: self.predictions,
+            }
+        )
+        if self.bands is not None:
+            frame[LOWER_KEY] = self.bands[0]
+            frame[UPPER_KEY] = self.bands[-1]
+        return frame.rename(
+            columns=forecast_columns(
+                get_backend(self.backend).short_label
+            )
+        )
+
+    def bands_frame(self) -> pd.DataFrame | None:
+        if self.bands is None:
+            return None
+        return pd.DataFrame(
+            {
+                LOWER_KEY: self.bands[0],
+                UPPER_KEY: self.bands[-1],
+            },
+            index=self.dates,
+        )
+
+
+def _ignore_report(message: str) -> None:
+    pass
+
+
+def run_pipeline(
+    request: ForecastRequest, report=_ignore_report
+) -> ForecastResult:
+    """Parse, train (or reuse) and forecast one flight log.
+
+    Free of UI state so it can run in a worker process; ``report`` is
+    called with a ``Progress`` at the start of each stage and while
+    boosting rounds and forecast cycles complete.
+    """
+    report = as_reporter(report)
+    recorder = SpanRecorder()
+    with recorder.span("parse") as span:
+        if request.digest:
+            remember_digest(
+                request.file_path, request.digest
+            )
+        df = load_flight_log(request.file_path)
+        span.rows = len(df)
+    data_key = file_digest(request.file_path)
+    # Tuned parameters are boosting parameters.
+    tuned = (
+        get_tuning_store().get(
+            request.engine or Path(request.file_path).stem,
+            data_key,
+            len(df),
+        )
+        if request.use_tuned
+        and get_backend(request.backend).boosted
+        else None
+    )
+    result = forecast_frame(
+        df,
+        data_key,
+        tuned.n_lags if tuned else request.n_lags,
+        request.n_steps,
+        request.strategy,
+        report=report,
+        model_kwargs=tuned.params if tuned else None,
+        recorder=recorder,
+        uncertainty=request.uncertainty,
+        limit=request.limit,
+        max_cycles=request.max_cycles,
+        backend=request.backend,
+    )
+    result.tuned = tuned is not None
+    with recorder.span("chart", rows=len(df)):
+        result.chart_data = build_chart_series(
+            df[TARGET_COLUMN],
+            pd.Series(
+                result.predictions, index=result.dates
+            ),
+            request.chart_points,
+            bands=result.bands_frame(),
+            threshold=request.limit,
+        )
+    return result
+
+
+def forecast_frame(
+    df: pd.DataFrame,
+    data_key: str,
+    n_lags: int,
+    n_steps: int,
+    strategy: str = "recursive",
+    report=_ignore_report,
+    model_kwargs: dict | None = None,
+    recorder: SpanRecorder | None = None,
+    uncertainty: bool = False,
+    limit: float | None = None,
+    max_cycles: int = LIMIT_MAX_CYCLES,
+    backend: str = DEFAULT_BACKEND,
+) -> ForecastResult:
+    """Forecast an already parsed log; ``data_key`` identifies its content.
+
+    With a ``limit``, also counts the cycles until the margin first
+    drops to it, looking up to ``max_cycles`` ahead.
+    """
+    recorder = recorder or SpanRecorder()
+    progress = as_reporter(report)
+    model_backend = get_backend(backend)
+    progress.stage("Création des caractéristiques lag...")
+    with recorder.span("lag_features", rows=len(df)):
+        lag_matrix = build_lag_matrix(df, n_lags)
+    if len(lag_matrix) == 0:
+        raise InsufficientDataError(
+            "Pas assez de données après la préparation pour entraîner le modèle."
+        )
+    progress.stage(
+        "Entraînement du modèle XGBoost..."
+        if model_backend.boosted
+        else "Entraînement du modèle ridge..."
+    )
+    params = model_backend.params(model_kwargs)
+    with recorder.span("train", rows=len(lag_matrix)):
+        training_mode = "full"
+        if strategy == "direct":
+            features = {
+                "n_lags": n_lags,
+                "strategy": strategy,
+            }
+            forecaster = DirectForecaster.fit(
+                model_backend.builder(params, progress),
+                df,
+                lag_matrix,
+                n_steps,
+                cache_key=(
+                    model_key(data_key, features, params)
+                    if model_backend.boosted
+                    else None
+                ),
+                stack=model_backend.boosted,
+            )
+        else:
+            model, training_mode = (
+                model_backend.fit_recursive(
+                    df,
+                    data_key,
+                    lag_matrix,
+                    n_lags,
+                    params,
+                    progress,
+                )
+            )
+    seed = forecast_seed(df, n_lags)
+    progress.stage(
+        "Génération des prévisions...",
+        0 if strategy == "direct" else n_steps,
+    )
+    with recorder.span("forecast", rows=n_steps):
+        if strategy == "direct":
+            predictions = forecaster.predict(seed, n_steps)[
+                0
+            ]
+        else:
+            predict = model_backend.predictor(model)
+            predictions = recursive_forecast(
+                predict,
+                seed,
+                n_lags,
+                n_steps,
+                on_step=progress.advance,
+            )[0]
+    bands = None
+    if uncertainty and model_backend.boosted:
+        progress.stage(
+            "Calcul des intervalles de prévision (P10/P90)...",
+            ENSEMBLE_SIZE * MODEL_PARAMS["n_estimators"]
+            + n_steps,
+        )
+        with recorder.span(
+            "ensemble", rows=len(lag_matrix)
+        ):
+            ensemble = BootstrapEnsemble.fit(
+                lag_matrix.X,
+                lag_matrix.y,
+                progress=progress,
+            )
+            bands = prediction_bands(
+                ensemble.forecast(
+                    seed,
+                    n_lags,
+                    n_steps,
+                    on_step=progress.advance,
+                )
+            )
+    remaining, horizon = None, 0
+    if limit is not None:
+        below = np.flatnonzero(predictions <= limit)
+        if len(below) or strategy == "direct":
+            remaining = (
+                float(below[0] + 1)
+                if len(below)
+                else np.inf
+            )
+            horizon = n_steps
+        else:
+            # Not crossed within the horizon: keep going, alone and
+            # without storing the path, until it does or hits the cap.
+            with recorder.span("limit", rows=max_cycles):
+                remaining = float(
+                    cycles_to_limit(
+                        lambda rows, active: predict(rows),
+                        seed,
+                        n_lags,
+                        limit,
+                        max_cycles,
+                    )[0]
+                )
+            horizon = max(max_cycles, n_steps)
+    dates = df.index[-1] + pd.to_timedelta(
+        np.arange(1, n_steps + 1), unit="D"
+    )
+    return ForecastResult(
+        dates,
+        predictions,
+        training_mode,
+        spans=recorder.spans,
+        bands=bands,
+        cycles_to_limit=remaining,
+        limit_horizon=horizon,
+        backend=model_backend.name,
+    )
+
+
+def fit_recursive(
+    df: pd.DataFrame,
+    data_key: str,
+    lag_matrix,
+    n_lags: int,
+    model_kwargs: dict | None = None,
+    backend: str = DEFAULT_BACKEND,
+):
+    """The one-step model ``forecast_frame`` uses, and its training mode."""
+    model_backend = get_backend(backend)
+    return model_backend.fit_recursive(
+        df,
+        data_key,
+        lag_matrix,
+        n_lags,
+        model_backend.params(model_kwargs),
+    )
\ No newline at end of file
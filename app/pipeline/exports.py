@@ -0,0 +1,150 @@
+import csv
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from app.pipeline.parse_cache import PYARROW_AVAILABLE
+from app.pipeline.storage import (
+    atomic_write,
+    cache_dir,
+    evict_lru,
+    touch,
+)
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+EXPORT_FORMATS = ("xlsx", "csv", "parquet")
+EXPORT_MAX_BYTES = int(
+    os.environ.get("EGT_EXPORT_MAX_BYTES", 1024**3)
+)
+EXPORT_CHUNK_ROWS = 10000
+SHEET_NAME = "Forecast"
+
+
+def available_formats() -> tuple[str, ...]:
+    if PYARROW_AVAILABLE:
+        return EXPORT_FORMATS
+    return tuple(
+        f for f in EXPORT_FORMATS if f != "parquet"
+    )
+
+
+def _text_chunks(df: pd.DataFrame):
+    """Row chunks with dates as ``YYYY-MM-DD`` and blanks as None."""
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start : start + EXPORT_CHUNK_ROWS]
+        columns = {}
+        for name, values in chunk.items():
+            if pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.strftime("%Y-%m-%d")
+            columns[name] = values.astype(object).where(
+                values.notna(), None
+            )
+        yield pd.DataFrame(columns)
+
+
+def write_xlsx(df: pd.DataFrame, path: Path) -> None:
+    """Stream ``df`` into a single-sheet workbook row by row."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    sheet.append([str(name) for name in df.columns])
+    for chunk in _text_chunks(df):
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+
+def write_csv(df: pd.DataFrame, path: Path) -> None:
+    with open(
+        path, "w", newline="", encoding="utf-8"
+    ) as out:
+        writer = csv.writer(out)
+        writer.writerow(df.columns)
+        for chunk in _text_chunks(df):
+            writer.writerows(
+                chunk.itertuples(index=False, name=None)
+            )
+
+
+def write_parquet(df: pd.DataFrame, path: Path) -> None:
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False), path
+    )
+
+
+_WRITERS = {
+    "xlsx": write_xlsx,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def write_export(
+    df: pd.DataFrame, path: Path, fmt: str
+) -> None:
+    _WRITERS[fmt](df, path)
+
+
+class ExportCache:
+    """Rendered downloads of stored forecasts, built once per format."""
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int = EXPORT_MAX_BYTES,
+    ):
+        self.directory = directory or cache_dir("exports")
+        self.max_bytes = max_bytes
+
+    def _path(self, artifact_id: str, fmt: str) -> Path:
+        if not artifact_id.isalnum():
+            raise KeyError(artifact_id)
+        return self.directory / f"{artifact_id}.{fmt}"
+
+    def get(
+        self, artifact_id: str, fmt: str, load
+    ) -> Path | None:
+        """Path of the export, rendering ``load()`` on a miss.
+
+        ``load`` returns the forecast frame, or None once the artifact
+        has expired.
+        """
+        if fmt not in available_formats():
+            raise ValueError(
+                f"Format d'export non disponible : {fmt}"
+            )
+        path = self._path(artifact_id, fmt)
+        if path.exists():
+            touch(path)
+            return path
+        df = load()
+        if df is None:
+            return None
+        atomic_write(
+            path, lambda tmp: write_export(df, tmp, fmt)
+        )
+        evict_lru(self.directory, self.max_bytes)
+        return path
+
+    def discard(self, artifact_id: str) -> None:
+        if not artifact_id:
+            return
+        for fmt in EXPORT_FORMATS:
+            self._path(artifact_id, fmt).unlink(
+                missing_ok=True
+            )
+
+
+_default_cache: ExportCache | None = None
+
+
+def get_export_cache() -> ExportCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ExportCache()
+    return _default_cache
\ No newline at end of file
@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+TARGET_COLUMN = "EGT Margin"
+EXOGENOUS_COLUMNS = ["Vibration of the core", "CSN"]
+FILL_CHUNK_ROWS = 65536
+
+
+@dataclass
+class LagMatrix:
+    X: np.ndarray
+    y: np.ndarray
+    index: pd.Index
+    n_lags: int
+    positions: np.ndarray
+
+    @property
+    def feature_names(self) -> list[str]:
+        return feature_names(self.n_lags)
+
+    def __len__(self) -> int:
+        return self.X.shape[0]
+
+
+def feature_names(n_lags: int) -> list[str]:
+    return [
+        f"lag_{i}" for i in range(1, n_lags + 1)
+    ] + EXOGENOUS_COLUMNS
+
+
+def forecast_seed(
+    df: pd.DataFrame, n_lags: int, csn_step: float = 1.0
+) -> np.ndarray:
+    """Feature row of the first cycle after the last observation.
+
+    The lags are the latest ``n_lags`` readings, most recent first, so
+    the newest reading is lag_1; vibration is carried over and CSN
+    advanced by ``csn_step``, as the recursion does for later cycles.
+    """
+    egt = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+    exog = df[EXOGENOUS_COLUMNS].to_numpy(dtype=np.float64)
+    seed = np.concatenate(
+        [egt[: -n_lags - 1 : -1], exog[-1]]
+    )
+    seed[-1] += csn_step
+    return seed.astype(np.float32)
+
+
+def build_lag_matrix(
+    df: pd.DataFrame, n_lags: int
+) -> LagMatrix:
+    """Build the C-contiguous float32 lag matrix in one pass.
+
+    Row ``t`` holds ``EGT[t-1] .. EGT[t-n_lags]`` followed by the
+    exogenous columns at ``t``; rows with any missing input are
+    dropped, matching the former ``shift``/``dropna`` construction.
+    """
+    egt = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+    exog = df[EXOGENOUS_COLUMNS].to_numpy(dtype=np.float64)
+    n_features = n_lags + exog.shape[1]
+    if len(egt) <= n_lags:
+        return LagMatrix(
+            np.empty((0, n_features), dtype=np.float32),
+            np.empty(0, dtype=np.float32),
+            df.index[:0],
+            n_lags,
+            np.empty(0, dtype=np.int64),
+        )
+    windows = sliding_window_view(egt, n_lags + 1)
+    nan_prefix = np.concatenate(
+        ([0], np.cumsum(np.isnan(egt)))
+    )
+    window_nans = (
+        nan_prefix[n_lags + 1 :] - nan_prefix[: -n_lags - 1]
+    )
+    valid = (window_nans == 0) & ~np.isnan(
+        exog[n_lags:]
+    ).any(axis=1)
+    rows = np.flatnonzero(valid)
+    X = np.empty((len(rows), n_features), dtype=np.float32)
+    y = np.empty(len(rows), dtype=np.float32)
+    for start in range(0, len(rows), FILL_CHUNK_ROWS):
+        chunk = rows[start : start + FILL_CHUNK_ROWS]
+        out = slice(start, start + len(chunk))
+        chunk_windows = windows[chunk]
+        X[out, :n_lags] = chunk_windows[:, -2::-1]
+        X[out, n_lags:] = exog[chunk + n_lags]
+        y[out] = chunk_windows[:, -1]
+    positions = rows + n_lags
+    return LagMatrix(
+        X, y, df.index[positions], n_lags, positions
+    )
\ No newline at end of file
@@ -0,0 +1,524 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.backends import (
+    DEFAULT_BACKEND,
+    get_backend,
+)
+from app.pipeline.chart_series import (
+    FORECAST_KEY,
+    forecast_columns,
+)
+from app.pipeline.engine import (
+    LIMIT_MAX_CYCLES,
+    fit_recursive,
+    forecast_frame,
+)
+from app.pipeline.features import (
+    build_lag_matrix,
+    forecast_seed,
+)
+from app.pipeline.ingest import load_flight_log, read_header
+from app.pipeline.jobs import (
+    JobCancelled,
+    JobExecutor,
+    JobRejected,
+)
+from app.pipeline.incremental import frame_hash
+from app.pipeline.parse_cache import (
+    file_digest,
+    get_parse_cache,
+    remember_digest,
+)
+from app.pipeline.progress import as_reporter
+from app.pipeline.recursive import cycles_to_limit
+from app.pipeline.storage import atomic_write, cache_dir
+
+ENGINE_COLUMNS = (
+    "Engine Serial",
+    "Engine Serial Number",
+    "ESN",
+    "Engine",
+)
+CYCLES_COLUMN = "Cycles To Limit"
+LIMIT_DATE_COLUMN = "Limit Date"
+FLEET_WORKERS = int(
+    os.environ.get("EGT_FLEET_WORKERS", os.cpu_count() or 1)
+)
+# How often a waiting fleet run checks for cancellation.
+FLEET_POLL_SECONDS = 0.2
+
+
+@dataclass
+class EngineTask:
+    engine: str
+    source: str
+    frame_key: str
+    rows: int
+    frame: pd.DataFrame | None = None
+
+
+@dataclass
+class EngineSummary:
+    engine: str
+    source: str
+    rows: int
+    status: str = "ok"
+    training_mode: str = ""
+    seconds: float = 0.0
+    rows_per_sec: float = 0.0
+    last_forecast: float | None = None
+    min_forecast: float | None = None
+
+
+@dataclass
+class FleetProgress:
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    resumed: int = 0
+    started: float = field(
+        default_factory=time.perf_counter
+    )
+
+    @property
+    def engines_per_min(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        computed = self.done - self.resumed
+        return (
+            60 * computed / elapsed if elapsed > 0 else 0.0
+        )
+
+    @property
+    def eta_seconds(self) -> float | None:
+        remaining = self.total - self.done - self.failed
+        rate = self.engines_per_min / 60
+        return remaining / rate if rate > 0 else None
+
+
+def find_engine_column(file_path: Path) -> str | None:
+    header = read_header(file_path)
+    return next(
+        (col for col in ENGINE_COLUMNS if col in header),
+        None,
+    )
+
+
+def _key(*parts: str) -> str:
+    return hashlib.sha256(
+        "\0".join(parts).encode()
+    ).hexdigest()
+
+
+def partition_engines(
+    paths: list[Path],
+    digests: list[str | None] | None = None,
+    report=None,
+) -> list[EngineTask]:
+    """Split workbooks into one parsed frame per engine.
+
+    A workbook with an engine-serial column may hold several engines;
+    otherwise the whole file is one engine named after its stem. Frames
+    are parked in the parse cache so workers can memory-map them.
+    ``digests``, when known, spare hashing the workbooks again.
+    """
+    cache = get_parse_cache()
+    tasks = []
+    for path, digest in zip(
+        paths, digests or [None] * len(paths)
+    ):
+        path = Path(path)
+        if digest:
+            remember_digest(path, digest)
+        engine_column = find_engine_column(path)
+        if engine_column is None:
+            groups = [(path.stem, load_flight_log(path))]
+        else:
+            df = load_flight_log(
+                path, text_columns=[engine_column]
+            )
+            groups = [
+                (
+                    str(engine),
+                    frame.drop(columns=engine_column),
+                )
+                for engine, frame in df.groupby(
+                    engine_column, sort=True
+                )
+            ]
+        for engine, frame in groups:
+            if engine_column is None:
+                frame_key = file_digest(path)
+                stored = frame_key in cache
+            else:
+                frame_key = _key(
+                    "fleet",
+                    engine,
+                    frame_hash(frame, len(frame)),
+                )
+                stored = cache.put(frame_key, frame)
+            tasks.append(
+                EngineTask(
+                    engine,
+                    path.name,
+                    frame_key,
+                    len(frame),
+                    None if stored else frame,
+                )
+            )
+    return tasks
+
+
+def forecast_engine(
+    task: EngineTask,
+    n_lags: int,
+    n_steps: int,
+    strategy: str,
+    backend: str = DEFAULT_BACKEND,
+    report=None,
+) -> tuple[pd.DataFrame, EngineSummary]:
+    """Worker-side forecast of one engine with single-threaded boosting.
+
+    With the direct strategy the engine's one-step recursive model is
+    trained too, so ``screen_fleet`` finds every model in the registry
+    instead of fitting them one after another itself.
+    """
+    df = task.frame
+    if df is None:
+        df = get_parse_cache().get(task.frame_key)
+    if df is None:
+        raise FileNotFoundError(task.frame_key)
+    start = time.perf_counter()
+    result = forecast_frame(
+        df,
+        task.frame_key,
+        n_lags,
+        n_steps,
+        strategy,
+        model_kwargs={"n_jobs": 1},
+        backend=backend,
+    )
+    if (
+        strategy == "direct"
+        and get_backend(backend).boosted
+    ):
+        fit_recursive(
+            df,
+            task.frame_key,
+            build_lag_matrix(df, n_lags),
+            n_lags,
+            {"n_jobs": 1},
+            backend,
+        )
+    seconds = time.perf_counter() - start
+    forecast = pd.DataFrame(
+        {
+            "Engine": task.engine,
+            "Date": result.dates,
+            FORECAST_KEY: result.predictions,
+        }
+    ).rename(
+        columns=forecast_columns(
+            get_backend(backend).short_label
+        )
+    )
+    return forecast, EngineSummary(
+        task.engine,
+        task.source,
+        task.rows,
+        training_mode=result.training_mode,
+        seconds=seconds,
+        rows_per_sec=(
+            task.rows / seconds if seconds else 0.0
+        ),
+        last_forecast=float(result.predictions[-1]),
+        min_forecast=float(result.predictions.min()),
+    )
+
+
+def screen_fleet(
+    tasks: list[EngineTask],
+    n_lags: int,
+    limit: float,
+    max_cycles: int = LIMIT_MAX_CYCLES,
+    backend: str = DEFAULT_BACKEND,
+    report=None,
+) -> pd.DataFrame:
+    """Rank engines by forecast cycles left before reaching ``limit``.
+
+    Each engine's recursive model, already in the registry from the
+    fleet run whatever its strategy, is stacked into one batched predictor (one tree
+    ensemble for XGBoost, one weight matrix for ridge) so every engine
+    advances in the same pass; an engine leaves the batch once it
+    crosses. Engines that cannot be forecast are left out.
+    """
+    progress = as_reporter(report or (lambda message: None))
+    progress.stage(
+        "Classement de la flotte : chargement des modèles...",
+        len(tasks),
+    )
+    screened, models, seeds = [], [], []
+    for task in tasks:
+        df = task.frame
+        if df is None:
+            df = get_parse_cache().get(task.frame_key)
+        if df is not None:
+            lag_matrix = build_lag_matrix(df, n_lags)
+            if len(lag_matrix):
+                model, _ = fit_recursive(
+                    df,
+                    task.frame_key,
+                    lag_matrix,
+                    n_lags,
+                    {"n_jobs": 1},
+                    backend,
+                )
+                screened.append((task, df.index[-1]))
+                models.append(model)
+                seeds.append(forecast_seed(df, n_lags))
+        progress.advance()
+    if not screened:
+        return pd.DataFrame(
+            columns=[
+                "Engine",
+                "Source",
+                CYCLES_COLUMN,
+                LIMIT_DATE_COLUMN,
+            ]
+        )
+    progress.stage(
+        "Classement de la flotte : projection jusqu'au seuil...",
+        max_cycles,
+    )
+    predict = get_backend(backend).member_predictor(models)
+    cycles = cycles_to_limit(
+        predict,
+        np.stack(seeds),
+        n_lags,
+        limit,
+        max_cycles,
+        on_step=progress.advance,
+    )
+    last_dates = pd.DatetimeIndex(
+        [last for _, last in screened]
+    )
+    reached = np.isfinite(cycles)
+    limit_dates = last_dates + pd.to_timedelta(
+        np.where(reached, cycles, 0), unit="D"
+    )
+    ranking = pd.DataFrame(
+        {
+            "Engine": [task.engine for task, _ in screened],
+            "Source": [task.source for task, _ in screened],
+            CYCLES_COLUMN: cycles,
+            LIMIT_DATE_COLUMN: limit_dates.where(reached),
+        }
+    )
+    return ranking.sort_values(
+        CYCLES_COLUMN, kind="stable", ignore_index=True
+    )
+
+
+class FleetRun:
+    """Results of one fleet run, persisted per engine so it can resume.
+
+    The run directory is named after the engines' data and the forecast
+    settings, so re-running the same inputs picks up where it stopped.
+    """
+
+    def __init__(
+        self,
+        tasks: list[EngineTask],
+        n_lags: int,
+        n_steps: int,
+        strategy: str,
+        backend: str = DEFAULT_BACKEND,
+        directory: Path | None = None,
+    ):
+        self.tasks = tasks
+        self.n_lags = n_lags
+        self.n_steps = n_steps
+        self.strategy = strategy
+        self.backend = backend
+        self.run_id = _key(
+            *sorted(task.frame_key for task in tasks),
+            str(n_lags),
+            str(n_steps),
+            strategy,
+            backend,
+        )[:16]
+        self.directory = directory or (
+            cache_dir("fleet") / self.run_id
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.progress = FleetProgress(total=len(tasks))
+        self._failures: dict[str, EngineSummary] = {}
+        self._cancelled = threading.Event()
+        self._executor: JobExecutor | None = None
+        self._in_flight: dict = {}
+
+    def _stem(self, task: EngineTask) -> Path:
+        return self.directory / _key(
+            task.engine, task.source
+        )
+
+    def is_complete(self, task: EngineTask) -> bool:
+        return (
+            self._stem(task).with_suffix(".json").exists()
+        )
+
+    def _save(
+        self,
+        task: EngineTask,
+        forecast: pd.DataFrame,
+        summary: EngineSummary,
+    ) -> None:
+        stem = self._stem(task)
+        atomic_write(
+            stem.with_suffix(".parquet"),
+            lambda tmp: forecast.to_parquet(
+                tmp, index=False
+            ),
+        )
+        payload = json.dumps(asdict(summary))
+        atomic_write(
+            stem.with_suffix(".json"),
+            lambda tmp: tmp.write_text(payload),
+        )
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        if self._executor is not None:
+            for job, _ in list(self._in_flight.values()):
+                self._executor.cancel(job.id)
+
+    def run(
+        self, executor: JobExecutor, session: str
+    ) -> None:
+        """Fan engines out over ``executor``; blocks until all finish."""
+        pending = []
+        for task in self.tasks:
+            if self.is_complete(task):
+                self.progress.done += 1
+                self.progress.resumed += 1
+            else:
+                pending.append(task)
+        in_flight = self._in_flight
+        self._executor = executor
+        while pending or in_flight:
+            while (
+                pending
+                and len(in_flight) < executor.max_workers
+                and not self._cancelled.is_set()
+            ):
+                task = pending[0]
+                try:
+                    job = executor.submit(
+                        session,
+                        forecast_engine,
+                        task,
+                        self.n_lags,
+                        self.n_steps,
+                        self.strategy,
+                        self.backend,
+                    )
+                except JobRejected:
+                    # The executor is shared; retry once one of ours
+                    # completes, unless nothing of ours is running.
+                    if not in_flight:
+                        raise
+                    break
+                pending.pop(0)
+                in_flight[job.future] = (job, task)
+            if self._cancelled.is_set():
+                for job, _ in in_flight.values():
+                    executor.cancel(job.id)
+                pending.clear()
+            if not in_flight:
+                break
+            done, _ = wait(
+                list(in_flight),
+                timeout=FLEET_POLL_SECONDS,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                job, task = in_flight.pop(future)
+                try:
+                    forecast, summary = future.result()
+                except JobCancelled:
+                    continue
+                except Exception as exc:
+                    self.progress.failed += 1
+                    self._failures[task.engine] = (
+                        EngineSummary(
+                            task.engine,
+                            task.source,
+                            task.rows,
+                            status=f"{type(exc).__name__}: {exc}",
+                        )
+                    )
+                    continue
+                self._save(task, forecast, summary)
+                self.progress.done += 1
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def summary(self) -> pd.DataFrame:
+        rows = []
+        for task in self.tasks:
+            path = self._stem(task).with_suffix(".json")
+            if path.exists():
+                rows.append(json.loads(path.read_text()))
+            elif task.engine in getattr(
+                self, "_failures", {}
+            ):
+                rows.append(
+                    asdict(self._failures[task.engine])
+                )
+        return pd.DataFrame(
+            rows,
+            columns=list(EngineSummary.__annotations__),
+        )
+
+    def combined(self) -> pd.DataFrame:
+        frames = [
+            pd.read_parquet(path)
+            for task in self.tasks
+            if self.is_complete(task)
+            and (
+                path := self._stem(task).with_suffix(
+                    ".parquet"
+                )
+            ).exists()
+        ]
+        if not frames:
+            forecast_column = forecast_columns(
+                get_backend(self.backend).short_label
+            )[FORECAST_KEY]
+            return pd.DataFrame(
+                columns=["Engine", "Date", forecast_column]
+            )
+        return pd.concat(frames, ignore_index=True)
+
+
+_fleet_executor: JobExecutor | None = None
+
+
+def get_fleet_executor() -> JobExecutor:
+    global _fleet_executor
+    if _fleet_executor is None:
+        _fleet_executor = JobExecutor(
+            max_workers=FLEET_WORKERS,
+            max_queued=FLEET_WORKERS,
+            max_per_session=2 * FLEET_WORKERS,
+        )
+    return _fleet_executor
\ No newline at end of file
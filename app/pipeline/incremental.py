@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.features import (
+    EXOGENOUS_COLUMNS,
+    TARGET_COLUMN,
+    build_lag_matrix,
+)
+from app.pipeline.model_registry import ModelRegistry
+from app.pipeline.storage import atomic_write
+
+# Lineage records kept per model configuration.
+LINEAGE_MAX_ENTRIES = 500
+INCREMENTAL_ROUNDS = int(
+    os.environ.get("EGT_INCREMENTAL_ROUNDS", 20)
+)
+INCREMENTAL_MAX_ROUNDS = int(
+    os.environ.get("EGT_INCREMENTAL_MAX_ROUNDS", 400)
+)
+INCREMENTAL_MAX_TAIL_FRACTION = float(
+    os.environ.get(
+        "EGT_INCREMENTAL_MAX_TAIL_FRACTION", 0.25
+    )
+)
+INCREMENTAL_DRIFT_RATIO = float(
+    os.environ.get("EGT_INCREMENTAL_DRIFT_RATIO", 1.5)
+)
+
+
+@dataclass
+class IncrementalPolicy:
+    """When an appended log may continue boosting instead of refitting."""
+
+    rounds: int = INCREMENTAL_ROUNDS
+    max_rounds: int = INCREMENTAL_MAX_ROUNDS
+    max_tail_fraction: float = INCREMENTAL_MAX_TAIL_FRACTION
+    drift_ratio: float = INCREMENTAL_DRIFT_RATIO
+
+
+@dataclass
+class LineageEntry:
+    key: str
+    config: str
+    rows: int
+    first_date: str
+    last_date: str
+    prefix_hash: str
+    # One-step persistence error on the training rows: the noise level
+    # that drift on appended cycles is measured against.
+    reference_rmse: float
+
+
+def frame_hash(df: pd.DataFrame, rows: int) -> str:
+    head = df.iloc[:rows]
+    hasher = hashlib.sha256()
+    hasher.update(
+        np.ascontiguousarray(
+            head.index.asi8, dtype=np.int64
+        ).tobytes()
+    )
+    hasher.update(
+        np.ascontiguousarray(
+            head[
+                [TARGET_COLUMN] + EXOGENOUS_COLUMNS
+            ].to_numpy(dtype=np.float64)
+        ).tobytes()
+    )
+    return hasher.hexdigest()
+
+
+def _rmse(predicted: np.ndarray, y: np.ndarray) -> float:
+    return float(np.sqrt(np.mean((predicted - y) ** 2)))
+
+
+def _lineage_entry(
+    key: str,
+    config: str,
+    df: pd.DataFrame,
+    reference_rmse: float,
+) -> LineageEntry:
+    return LineageEntry(
+        key,
+        config,
+        len(df),
+        df.index[0].isoformat(),
+        df.index[-1].isoformat(),
+        frame_hash(df, len(df)),
+        reference_rmse,
+    )
+
+
+class LineageIndex:
+    """Which stored model was trained on which rows of which log.
+
+    Each model gets its own ``<config>/<key>.json`` record, written by
+    atomic rename, so fleet workers recording concurrently from
+    separate processes never overwrite each other's entries.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _records(self, config: str) -> list[Path]:
+        # Skip records still being written by atomic_write.
+        return [
+            path
+            for path in (self.directory / config).glob(
+                "*.json"
+            )
+            if not path.name.startswith(".tmp-")
+        ]
+
+    def _load(self, config: str) -> list[LineageEntry]:
+        entries = []
+        for path in self._records(config):
+            try:
+                raw = json.loads(path.read_text())
+            except (FileNotFoundError, ValueError):
+                continue
+            entries.append(LineageEntry(**raw))
+        return entries
+
+    def record(self, entry: LineageEntry) -> None:
+        target = self.directory / entry.config
+        target.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(asdict(entry))
+        atomic_write(
+            target / f"{entry.key}.json",
+            lambda tmp: tmp.write_text(payload),
+        )
+        records = self._records(entry.config)
+        if len(records) > LINEAGE_MAX_ENTRIES:
+            dated = []
+            for path in records:
+                try:
+                    dated.append(
+                        (path.stat().st_mtime, path)
+                    )
+                except FileNotFoundError:
+                    continue
+            dated.sort()
+            for _, path in dated[:-LINEAGE_MAX_ENTRIES]:
+                path.unlink(missing_ok=True)
+
+    def find_prefix(
+        self, config: str, df: pd.DataFrame
+    ) -> LineageEntry | None:
+        """Longest recorded log that ``df`` strictly extends."""
+        if df.empty:
+            return None
+        first_date = df.index[0].isoformat()
+        candidates = sorted(
+            (
+                e
+                for e in self._load(config)
+                if e.rows < len(df)
+                and e.first_date == first_date
+                and df.index[e.rows - 1].isoformat()
+                == e.last_date
+            ),
+            key=lambda e: e.rows,
+            reverse=True,
+        )
+        for entry in candidates:
+            if (
+                frame_hash(df, entry.rows)
+                == entry.prefix_hash
+            ):
+                return entry
+        return None
+
+
+def fit_with_history(
+    registry: ModelRegistry,
+    cache_key: str,
+    config_key: str,
+    df: pd.DataFrame,
+    n_lags: int,
+    make_model,
+    training_set,
+    policy: IncrementalPolicy | None = None,
+):
+    """Load, incrementally update or fully train the recursive model.
+
+    Returns ``(model, mode)`` with mode ``"cached"``, ``"incremental"``
+    or ``"full"``.
+    """
+    policy = policy or IncrementalPolicy()
+    model = registry.get(cache_key, make_model)
+    if model is not None:
+        return model, "cached"
+    lineage = LineageIndex(registry.directory / "lineage")
+    entry = (
+        lineage.find_prefix(config_key, df)
+        if registry.enabled
+        else None
+    )
+    base = (
+        registry.get(entry.key, make_model)
+        if entry
+        else None
+    )
+    if base is not None:
+        tail = build_lag_matrix(
+            df.iloc[max(0, entry.rows - n_lags) :], n_lags
+        )
+        new_rows = len(df) - entry.rows
+        rounds = (
+            base.get_booster().num_boosted_rounds()
+            + policy.rounds
+        )
+        if (
+            len(tail)
+            and new_rows
+            <= policy.max_tail_fraction * entry.rows
+            and rounds <= policy.max_rounds
+            and _rmse(base.predict(tail.X), tail.y)
+            <= policy.drift_ratio
+            * max(entry.reference_rmse, 1e-6)
+        ):
+            model = make_model(n_estimators=policy.rounds)
+            model.fit(
+                tail.X, tail.y, xgb_model=base.get_booster()
+            )
+            registry.put(cache_key, model)
+            lineage.record(
+                _lineage_entry(
+                    cache_key,
+                    config_key,
+                    df,
+                    entry.reference_rmse,
+                )
+            )
+            return model, "incremental"
+    X, y = training_set()
+    model = make_model()
+    model.fit(X, y)
+    if registry.enabled:
+        registry.put(cache_key, model)
+        lineage.record(
+            _lineage_entry(
+                cache_key,
+                config_key,
+                df,
+                _rmse(X[:, 0], y),
+            )
+        )
+    return model, "full"
\ No newline at end of file
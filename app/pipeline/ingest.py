@@ -0,0 +1,285 @@
+import hashlib
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.parse_cache import (
+    file_digest,
+    get_parse_cache,
+)
+
+HEADER_ROW = 7
+DATE_COLUMN = "Flight DateTime"
+VALUE_COLUMNS = [
+    "EGT Margin",
+    "Vibration of the core",
+    "CSN",
+]
+FLIGHT_LOG_COLUMNS = [DATE_COLUMN] + VALUE_COLUMNS
+CHUNK_ROWS = 65536
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    seconds: float = 0.0
+    peak_memory_bytes: int | None = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        if self.seconds <= 0:
+            return 0.0
+        return self.rows / self.seconds
+
+
+def read_flight_log(file_path: Path) -> pd.DataFrame:
+    df = pd.read_excel(file_path, header=HEADER_ROW)
+    df.dropna(how="all", inplace=True)
+    df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN])
+    df.set_index(DATE_COLUMN, inplace=True)
+    df.sort_index(inplace=True)
+    return df
+
+
+def _to_float(value) -> float:
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class _ColumnBuilder:
+    """Accumulates one column into fixed-size typed chunks.
+
+    ``kind`` is ``"datetime"``, ``"number"`` or ``"text"``.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.chunks: list[np.ndarray] = []
+        self.buffer = np.empty(
+            CHUNK_ROWS,
+            dtype=(
+                np.float64 if kind == "number" else object
+            ),
+        )
+        self.size = 0
+        self.integral = True
+
+    def append(self, value) -> None:
+        if self.kind == "number":
+            if self.integral and not (
+                isinstance(value, int)
+                and not isinstance(value, bool)
+                or isinstance(value, float)
+                and value.is_integer()
+            ):
+                self.integral = False
+            self.buffer[self.size] = _to_float(value)
+        elif self.kind == "text":
+            self.buffer[self.size] = (
+                None
+                if value is None
+                else str(value).strip()
+            )
+        else:
+            self.buffer[self.size] = value
+        self.size += 1
+        if self.size == CHUNK_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self.size:
+            return
+        chunk = self.buffer[: self.size]
+        if self.kind == "datetime":
+            chunk = pd.to_datetime(chunk).to_numpy()
+        else:
+            chunk = chunk.copy()
+        self.chunks.append(chunk)
+        self.size = 0
+
+    def finish(self) -> np.ndarray:
+        self._flush()
+        if not self.chunks:
+            if self.kind == "datetime":
+                return np.array([], dtype="datetime64[ns]")
+            return np.array([], dtype=self.buffer.dtype)
+        values = np.concatenate(self.chunks)
+        self.chunks = []
+        if self.kind == "number" and self.integral:
+            values = values.astype(np.int64)
+        return values
+
+
+def read_header(file_path: Path) -> list[str]:
+    """Column names on the header row, without reading any data."""
+    if str(file_path).lower().endswith(".xls"):
+        return [
+            str(col)
+            for col in pd.read_excel(
+                file_path, header=HEADER_ROW, nrows=0
+            ).columns
+        ]
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(
+        file_path, read_only=True, data_only=True
+    )
+    try:
+        rows = workbook.worksheets[0].iter_rows(
+            min_row=HEADER_ROW + 1,
+            max_row=HEADER_ROW + 1,
+            values_only=True,
+        )
+        return [
+            str(name)
+            for name in next(rows, ())
+            if name is not None
+        ]
+    finally:
+        workbook.close()
+
+
+def stream_flight_log(
+    file_path: Path,
+    columns: list[str] | None = None,
+    measure_memory: bool = False,
+    text_columns: list[str] | tuple = (),
+) -> tuple[pd.DataFrame, IngestStats]:
+    """Read only the needed columns of an .xlsx log row by row.
+
+    Produces the same frame as ``read_flight_log`` restricted to
+    ``columns`` (numeric) and ``text_columns`` without materialising
+    the full sheet, except that integer columns stay integers when
+    the sheet has blank rows.
+    """
+    from openpyxl import load_workbook
+
+    value_columns = [
+        col
+        for col in (columns or FLIGHT_LOG_COLUMNS)
+        if col != DATE_COLUMN
+    ]
+    stats = IngestStats()
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        workbook = load_workbook(
+            file_path, read_only=True, data_only=True
+        )
+        try:
+            rows = workbook.worksheets[0].iter_rows(
+                min_row=HEADER_ROW + 1, values_only=True
+            )
+            header = next(rows, ())
+            positions = {}
+            for pos, name in enumerate(header):
+                if name is not None:
+                    positions.setdefault(str(name), pos)
+            wanted = (
+                [DATE_COLUMN]
+                + value_columns
+                + list(text_columns)
+            )
+            missing = [
+                col
+                for col in wanted
+                if col not in positions
+            ]
+            if missing:
+                raise KeyError(missing[0])
+            indices = [positions[col] for col in wanted]
+            builders = (
+                [_ColumnBuilder("datetime")]
+                + [
+                    _ColumnBuilder("number")
+                    for _ in value_columns
+                ]
+                + [
+                    _ColumnBuilder("text")
+                    for _ in text_columns
+                ]
+            )
+            width = max(indices) + 1
+            for row in rows:
+                if len(row) < width:
+                    row = tuple(row) + (None,) * (
+                        width - len(row)
+                    )
+                values = [row[i] for i in indices]
+                if all(value is None for value in values):
+                    continue
+                for builder, value in zip(builders, values):
+                    builder.append(value)
+                stats.rows += 1
+        finally:
+            workbook.close()
+        arrays = [builder.finish() for builder in builders]
+        df = pd.DataFrame(
+            dict(zip(wanted[1:], arrays[1:])),
+            index=pd.DatetimeIndex(
+                arrays[0], name=DATE_COLUMN
+            ),
+        )
+        df.sort_index(inplace=True)
+        stats.seconds = time.perf_counter() - start
+        if measure_memory:
+            _, stats.peak_memory_bytes = (
+                tracemalloc.get_traced_memory()
+            )
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    return df, stats
+
+
+def load_flight_log(
+    file_path: Path,
+    use_cache: bool = True,
+    text_columns: list[str] | tuple = (),
+) -> pd.DataFrame:
+    """Return the cleaned flight log, skipping Excel parsing on a cache hit."""
+    cache = get_parse_cache() if use_cache else None
+    key = None
+    if cache:
+        key = file_digest(file_path)
+        if text_columns:
+            key = hashlib.sha256(
+                "\0".join([key, *text_columns]).encode()
+            ).hexdigest()
+    df = cache.get(key) if cache else None
+    if df is None:
+        if str(file_path).lower().endswith(".xls"):
+            df = read_flight_log(file_path)[
+                VALUE_COLUMNS + list(text_columns)
+            ]
+        else:
+            df, _ = stream_flight_log(
+                file_path, text_columns=text_columns
+            )
+        if cache:
+            cache.put(key, df)
+    return df
+
+
+if __name__ == "__main__":
+    import sys
+
+    for arg in sys.argv[1:]:
+        frame, ingest_stats = stream_flight_log(
+            Path(arg), measure_memory=True
+        )
+        print(
+            f"{arg}: {ingest_stats.rows} rows in "
+            f"{ingest_stats.seconds:.2f}s "
+            f"({ingest_stats.rows_per_sec:,.0f} rows/s), "
+            f"peak {ingest_stats.peak_memory_bytes / 1024**2:.1f} MiB"
+        )
\ No newline at end of file
@@ -0,0 +1,282 @@
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from concurrent.futures import Future
+
+from app.pipeline.metrics import (
+    job_seconds,
+    job_wait_seconds,
+    jobs_total,
+)
+from app.pipeline.progress import Progress
+
+MAX_WORKERS = int(
+    os.environ.get(
+        "EGT_MAX_WORKERS", min(2, os.cpu_count() or 1)
+    )
+)
+MAX_QUEUED_JOBS = int(
+    os.environ.get("EGT_MAX_QUEUED_JOBS", 16)
+)
+MAX_JOBS_PER_SESSION = int(
+    os.environ.get("EGT_MAX_JOBS_PER_SESSION", 1)
+)
+
+
+class JobRejected(RuntimeError):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class RemoteTraceback(Exception):
+    def __init__(self, tb: str):
+        self.tb = tb
+
+    def __str__(self) -> str:
+        return self.tb
+
+
+def _worker_main(conn) -> None:
+    def report(message: str) -> None:
+        conn.send(("progress", message))
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args = task
+        try:
+            reply = ("ok", fn(*args, report=report))
+        except BaseException as exc:
+            reply = ("error", exc, traceback.format_exc())
+        try:
+            conn.send(reply)
+        except Exception as exc:
+            conn.send(
+                (
+                    "error",
+                    RuntimeError(
+                        f"Unpicklable job reply: {exc!r}"
+                    ),
+                    traceback.format_exc(),
+                )
+            )
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class Job:
+    def __init__(self, session: str, fn, args: tuple):
+        self.id = uuid.uuid4().hex
+        self.session = session
+        self.fn = fn
+        self.args = args
+        self.future: Future = Future()
+        self.state = "queued"
+        self.stage = ""
+        self.progress: Progress | None = None
+        self.submitted = time.monotonic()
+
+    @property
+    def operation(self) -> str:
+        return getattr(self.fn, "__name__", "job")
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float | None = None):
+        return self.future.result(timeout)
+
+
+class JobExecutor:
+    """Runs jobs in worker processes so the event loop stays free.
+
+    Workers are kept warm between jobs. The queue is bounded, each
+    session may only have ``max_per_session`` jobs queued or running,
+    and cancelling a running job kills its worker process. Job functions
+    receive a ``report`` keyword to publish their current stage, as a
+    message or a ``Progress``; only the latest one is kept.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        max_queued: int = MAX_QUEUED_JOBS,
+        max_per_session: int = MAX_JOBS_PER_SESSION,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        self.max_per_session = max_per_session
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._queue: deque[Job] = deque()
+        self._running: dict[str, tuple[Job, _Worker]] = {}
+        self._idle: list[_Worker] = []
+        self._jobs: dict[str, Job] = {}
+
+    def submit(self, session: str, fn, *args) -> Job:
+        with self._lock:
+            active = sum(
+                1
+                for job in self._jobs.values()
+                if job.session == session
+            )
+            if active >= self.max_per_session:
+                jobs_total().inc(
+                    getattr(fn, "__name__", "job"),
+                    "rejected",
+                )
+                raise JobRejected(
+                    "Une prévision est déjà en cours pour cette session."
+                )
+            if len(self._queue) >= self.max_queued:
+                jobs_total().inc(
+                    getattr(fn, "__name__", "job"),
+                    "rejected",
+                )
+                raise JobRejected(
+                    "La file d'attente est pleine, veuillez réessayer plus tard."
+                )
+            job = Job(session, fn, args)
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._dispatch()
+        return job
+
+    def position(self, job: Job) -> int:
+        """1-based queue position, or 0 once the job has started."""
+        with self._lock:
+            try:
+                return self._queue.index(job) + 1
+            except ValueError:
+                return 0
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state == "cancelled":
+                return False
+            if job.state == "queued":
+                self._queue.remove(job)
+                del self._jobs[job_id]
+                job.state = "cancelled"
+                jobs_total().inc(job.operation, "cancelled")
+                job.future.set_exception(JobCancelled())
+                return True
+            job.state = "cancelled"
+            _, worker = self._running[job_id]
+        # The job's runner thread sees the closed pipe and finishes up.
+        worker.kill()
+        return True
+
+    def _dispatch(self) -> None:
+        while (
+            self._queue
+            and len(self._running) < self.max_workers
+        ):
+            job = self._queue.popleft()
+            worker = (
+                self._idle.pop()
+                if self._idle
+                else _Worker(self._context)
+            )
+            job.state = "running"
+            job_wait_seconds().observe(
+                job.operation,
+                value=time.monotonic() - job.submitted,
+            )
+            self._running[job.id] = (job, worker)
+            threading.Thread(
+                target=self._run,
+                args=(job, worker),
+                name=f"egt-job-{job.id[:8]}",
+                daemon=True,
+            ).start()
+
+    def _run(self, job: Job, worker: _Worker) -> None:
+        try:
+            worker.conn.send((job.fn, job.args))
+            reply = worker.conn.recv()
+            while reply[0] == "progress":
+                if isinstance(reply[1], Progress):
+                    job.progress = reply[1]
+                    job.stage = reply[1].stage
+                else:
+                    job.progress = None
+                    job.stage = reply[1]
+                reply = worker.conn.recv()
+        except (EOFError, OSError):
+            reply = ("lost",)
+        with self._lock:
+            del self._running[job.id]
+            del self._jobs[job.id]
+            cancelled = job.state == "cancelled"
+            job.state = "done"
+            if reply[0] != "lost" and worker.is_alive():
+                self._idle.append(worker)
+            else:
+                worker.kill()
+            self._dispatch()
+        if cancelled:
+            outcome = "cancelled"
+        elif reply[0] in ("ok", "error"):
+            outcome = reply[0]
+        else:
+            outcome = "lost"
+        jobs_total().inc(job.operation, outcome)
+        job_seconds().observe(
+            job.operation,
+            value=time.monotonic() - job.submitted,
+        )
+        if cancelled:
+            job.future.set_exception(JobCancelled())
+        elif reply[0] == "ok":
+            job.future.set_result(reply[1])
+        elif reply[0] == "error":
+            exc = reply[1]
+            exc.__cause__ = RemoteTraceback(reply[2])
+            job.future.set_exception(exc)
+        else:
+            job.future.set_exception(
+                RuntimeError(
+                    "Le processus de calcul s'est arrêté de manière inattendue."
+                )
+            )
+
+
+_default_executor: JobExecutor | None = None
+
+
+def get_executor() -> JobExecutor:
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = JobExecutor()
+    return _default_executor
\ No newline at end of file
@@ -0,0 +1,286 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+
+@dataclass
+class Span:
+    name: str
+    seconds: float = 0.0
+    rows: int | None = None
+    peak_memory_bytes: int | None = None
+
+
+def _reset_peak_memory() -> None:
+    # Linux lets a process reset its resident high-water mark, which
+    # turns VmHWM into a per-stage peak.
+    try:
+        with open("/proc/self/clear_refs", "w") as refs:
+            refs.write("5")
+    except OSError:
+        pass
+
+
+def _peak_memory() -> int | None:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # Lifetime peak; kilobytes on Linux, bytes on macOS.
+    return resource.getrusage(
+        resource.RUSAGE_SELF
+    ).ru_maxrss
+
+
+class SpanRecorder:
+    """Collects one timed span per pipeline stage."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    @contextmanager
+    def span(self, name: str, rows: int | None = None):
+        span = Span(name, rows=rows)
+        _reset_peak_memory()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.seconds = time.perf_counter() - start
+            span.peak_memory_bytes = _peak_memory()
+            self.spans.append(span)
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = (
+                self._values.get(labels, 0.0) + amount
+            )
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for labels, value in sorted(
+                self._values.items()
+            ):
+                lines.append(
+                    f"{self.name}{_format_labels(self.labels, labels)} {value}"
+                )
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple,
+        buckets: tuple = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # Per label set: one count per bucket plus +Inf, and the sum.
+        self._series: dict[
+            tuple, tuple[list[int], list]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *labels, value: float) -> None:
+        with self._lock:
+            counts, total = self._series.setdefault(
+                labels,
+                ([0] * (len(self.buckets) + 1), [0.0]),
+            )
+            counts[
+                bisect.bisect_left(self.buckets, value)
+            ] += 1
+            total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} histogram",
+        ]
+        names = self.labels + ("le",)
+        with self._lock:
+            for labels, (counts, total) in sorted(
+                self._series.items()
+            ):
+                cumulative = 0
+                for bound, count in zip(
+                    self.buckets + ("+Inf",), counts
+                ):
+                    cumulative += count
+                    lines.append(
+                        f"{self.name}_bucket"
+                        f"{_format_labels(names, labels + (bound,))}"
+                        f" {cumulative}"
+                    )
+                series = _format_labels(self.labels, labels)
+                lines.append(
+                    f"{self.name}_sum{series} {total[0]}"
+                )
+                lines.append(
+                    f"{self.name}_count{series} {cumulative}"
+                )
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args)
+            return self._metrics[name]
+
+    def counter(
+        self, name: str, help: str, labels: tuple = ()
+    ) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get(
+            Histogram, name, help, labels, buckets
+        )
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+_default_registry: MetricsRegistry | None = None
+
+
+def get_metrics() -> MetricsRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
+
+
+def stage_seconds() -> Histogram:
+    return get_metrics().histogram(
+        "egt_stage_duration_seconds",
+        "Duration of one pipeline stage.",
+        ("operation", "stage"),
+    )
+
+
+def stage_rows() -> Counter:
+    return get_metrics().counter(
+        "egt_stage_rows_total",
+        "Rows processed by a pipeline stage.",
+        ("operation", "stage"),
+    )
+
+
+def job_seconds() -> Histogram:
+    return get_metrics().histogram(
+        "egt_job_duration_seconds",
+        "Time from submission to completion of a job.",
+        ("operation",),
+    )
+
+
+def job_wait_seconds() -> Histogram:
+    return get_metrics().histogram(
+        "egt_job_queue_wait_seconds",
+        "Time a job spent queued before a worker took it.",
+        ("operation",),
+    )
+
+
+def jobs_total() -> Counter:
+    return get_metrics().counter(
+        "egt_jobs_total",
+        "Jobs by outcome (ok, error, lost, cancelled, rejected).",
+        ("operation", "outcome"),
+    )
+
+
+def record_spans(operation: str, spans: list[Span]) -> None:
+    for span in spans:
+        stage_seconds().observe(
+            operation, span.name, value=span.seconds
+        )
+        if span.rows:
+            stage_rows().inc(
+                operation, span.name, amount=span.rows
+            )
\ No newline at end of file
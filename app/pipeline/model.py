@@ -0,0 +1,34 @@
+import importlib.util
+
+# Checked without importing: xgboost takes over a second to load and
+# is only needed once a model is actually trained.
+XGBOOST_AVAILABLE = (
+    importlib.util.find_spec("xgboost") is not None
+)
+
+
+def _regressor_class():
+    if not XGBOOST_AVAILABLE:
+        raise ImportError(
+            "XGBoost n'est pas installé ; utilisez le modèle ridge."
+        )
+    from xgboost import XGBRegressor
+
+    return XGBRegressor
+
+
+def __getattr__(name: str):
+    if name == "XGBRegressor":
+        return _regressor_class()
+    raise AttributeError(name)
+
+
+MODEL_PARAMS = {
+    "objective": "reg:squarederror",
+    "n_estimators": 100,
+    "random_state": 42,
+}
+
+
+def make_model(**kwargs):
+    return _regressor_class()(**{**MODEL_PARAMS, **kwargs})
\ No newline at end of file
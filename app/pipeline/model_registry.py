@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+from importlib import metadata
+from pathlib import Path
+
+from app.pipeline.storage import (
+    atomic_write,
+    cache_dir,
+    evict_lru,
+    touch,
+)
+
+MODEL_REGISTRY_MAX_BYTES = int(
+    os.environ.get("EGT_MODEL_REGISTRY_MAX_BYTES", 1024**3)
+)
+# Thread counts change how fast a model trains, not what it learns.
+_NON_MODEL_PARAMS = {"n_jobs", "nthread", "verbosity"}
+
+
+def _xgboost_version() -> str | None:
+    try:
+        return metadata.version("xgboost")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def config_key(features: dict, params: dict) -> str:
+    payload = json.dumps(
+        {
+            "features": features,
+            "params": {
+                name: value
+                for name, value in params.items()
+                if name not in _NON_MODEL_PARAMS
+            },
+            "xgboost": _xgboost_version(),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def model_key(
+    data_digest: str, features: dict, params: dict
+) -> str:
+    return hashlib.sha256(
+        f"{data_digest}:{config_key(features, params)}".encode()
+    ).hexdigest()
+
+
+class ModelRegistry:
+    """Trained boosters saved in XGBoost's UBJSON format.
+
+    Survives restarts; files are touched on every hit and the least
+    recently used ones are deleted once the directory exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int = MODEL_REGISTRY_MAX_BYTES,
+    ):
+        self.directory = directory or cache_dir("models")
+        self.max_bytes = max_bytes
+        self.enabled = _xgboost_version() is not None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.ubj"
+
+    def get(self, key: str, make_model):
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        model = make_model()
+        try:
+            model.load_model(path)
+        except Exception:
+            path.unlink(missing_ok=True)
+            return None
+        touch(path)
+        return model
+
+    def put(self, key: str, model) -> None:
+        if not self.enabled:
+            return
+        atomic_write(self._path(key), model.save_model)
+        evict_lru(self.directory, self.max_bytes, "*.ubj")
+
+    def fit(
+        self, key: str | None, make_model, training_set
+    ):
+        """Return the stored model for ``key`` or train and store one.
+
+        ``training_set`` is only called on a miss and returns ``(X, y)``.
+        """
+        model = self.get(key, make_model) if key else None
+        if model is None:
+            model = make_model()
+            model.fit(*training_set())
+            if key:
+                self.put(key, model)
+        return model
+
+
+_default_registry: ModelRegistry | None = None
+
+
+def get_model_registry() -> ModelRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
\ No newline at end of file
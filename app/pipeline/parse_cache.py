@@ -0,0 +1,123 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from app.pipeline.storage import (
+    atomic_write,
+    cache_dir,
+    evict_lru,
+    touch,
+)
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PARSER_VERSION = 2
+PARSE_CACHE_MAX_BYTES = int(
+    os.environ.get("EGT_PARSE_CACHE_MAX_BYTES", 2 * 1024**3)
+)
+_HASH_CHUNK = 1024 * 1024
+_digest_memo: dict[tuple[str, int, int], str] = {}
+
+
+def _memo_key(path: Path) -> tuple[str, int, int]:
+    stat = os.stat(path)
+    return (
+        str(Path(path).resolve()),
+        stat.st_size,
+        stat.st_mtime_ns,
+    )
+
+
+def remember_digest(path: Path, digest: str) -> None:
+    """Record a sha256 already known for ``path``, e.g. from its upload."""
+    _digest_memo[_memo_key(path)] = digest
+
+
+def file_digest(path: Path) -> str:
+    memo_key = _memo_key(path)
+    digest = _digest_memo.get(memo_key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as infile:
+            while chunk := infile.read(_HASH_CHUNK):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+class ParseCache:
+    """Parsed flight logs stored as uncompressed Arrow IPC files.
+
+    Entries are keyed by the workbook's content hash, read back with
+    memory mapping and evicted least-recently-used past ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int = PARSE_CACHE_MAX_BYTES,
+    ):
+        self.directory = directory or cache_dir("parsed")
+        self.max_bytes = max_bytes
+
+    def _path(self, digest: str) -> Path:
+        return (
+            self.directory
+            / f"{digest}-v{PARSER_VERSION}.arrow"
+        )
+
+    def __contains__(self, digest: str) -> bool:
+        return (
+            PYARROW_AVAILABLE
+            and self._path(digest).exists()
+        )
+
+    def get(self, digest: str) -> pd.DataFrame | None:
+        if not PYARROW_AVAILABLE:
+            return None
+        path = self._path(digest)
+        try:
+            table = feather.read_table(
+                path, memory_map=True
+            )
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        touch(path)
+        return table.to_pandas()
+
+    def put(self, digest: str, df: pd.DataFrame) -> bool:
+        if not PYARROW_AVAILABLE:
+            return False
+        try:
+            table = pa.Table.from_pandas(
+                df, preserve_index=True
+            )
+        except (pa.ArrowException, TypeError, ValueError):
+            return False
+        atomic_write(
+            self._path(digest),
+            lambda tmp: feather.write_feather(
+                table, tmp, compression="uncompressed"
+            ),
+        )
+        evict_lru(self.directory, self.max_bytes, "*.arrow")
+        return True
+
+
+_default_cache: ParseCache | None = None
+
+
+def get_parse_cache() -> ParseCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
\ No newline at end of file
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+PROGRESS_PUSHES_PER_SECOND = float(
+    os.environ.get("EGT_PROGRESS_PUSHES_PER_SECOND", 2)
+)
+
+
+@dataclass
+class Progress:
+    stage: str
+    done: int = 0
+    total: int = 0
+    eta_seconds: float | None = None
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+
+class ProgressReporter:
+    """Counts work units of the current stage for a ``report`` callback.
+
+    ``report`` gets a ``Progress`` when a stage starts and then at most
+    ``rate`` times per second however often ``advance`` is called, so
+    per-round or per-cycle counting costs no extra messages. Calling
+    the reporter with a message starts a stage of unknown length,
+    which keeps it usable wherever a plain ``report`` is expected.
+    """
+
+    def __init__(
+        self,
+        report,
+        rate: float = PROGRESS_PUSHES_PER_SECOND,
+    ):
+        self._report = report
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._stage = ""
+        self._done = 0
+        self._total = 0
+        self._started = time.monotonic()
+        self._last_push = 0.0
+
+    def __call__(self, message: str) -> None:
+        self.stage(message)
+
+    def stage(self, message: str, total: int = 0) -> None:
+        with self._lock:
+            self._stage = message
+            self._done = 0
+            self._total = total
+            self._started = time.monotonic()
+            self._push(self._started)
+
+    def add_total(self, units: int) -> None:
+        with self._lock:
+            self._total += units
+
+    def advance(self, units: int = 1) -> None:
+        with self._lock:
+            self._done += units
+            now = time.monotonic()
+            if now - self._last_push >= self._interval:
+                self._push(now)
+
+    def _push(self, now: float) -> None:
+        self._last_push = now
+        eta = None
+        if self._done and self._total:
+            eta = (
+                (now - self._started)
+                * (self._total - self._done)
+                / self._done
+            )
+        self._report(
+            Progress(
+                self._stage,
+                self._done,
+                self._total,
+                eta,
+            )
+        )
+
+
+def as_reporter(report) -> ProgressReporter:
+    if isinstance(report, ProgressReporter):
+        return report
+    return ProgressReporter(report)
+
+
+def boosting_callback(
+    progress: ProgressReporter, rounds: int = 0
+):
+    """An XGBoost training callback advancing ``progress`` per round.
+
+    ``rounds`` is added to the stage total when training starts; leave
+    it at 0 when the stage was started with the full total.
+    """
+    from xgboost.callback import TrainingCallback
+
+    class RoundProgress(TrainingCallback):
+        def before_training(self, model):
+            if rounds:
+                progress.add_total(rounds)
+            return model
+
+        def after_iteration(
+            self, model, epoch, evals_log
+        ) -> bool:
+            progress.advance()
+            return False
+
+    return RoundProgress()
\ No newline at end of file
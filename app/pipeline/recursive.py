@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class LagRing:
+    """Preallocated ring buffer holding the lag features of each series.
+
+    ``rows`` is the reusable (n_series, n_features) model input, lag_1
+    (the latest value) first as in ``build_lag_matrix``. A push moves
+    ``head`` back onto the oldest lag, overwrites it with the new value
+    and rotates the view so that value becomes lag_1, without
+    allocating per step.
+    """
+
+    def __init__(self, seed: np.ndarray, n_lags: int):
+        seed = np.atleast_2d(np.asarray(seed, np.float32))
+        self.n_lags = n_lags
+        self.rows = seed.copy()
+        self.ring = seed[:, :n_lags].copy()
+        self.head = 0
+        self._offsets = np.arange(n_lags)
+        self._order = np.empty(n_lags, dtype=np.int64)
+
+    def push(self, values: np.ndarray) -> None:
+        self.head = (self.head - 1) % self.n_lags
+        self.ring[:, self.head] = values
+        np.add(self.head, self._offsets, out=self._order)
+        np.mod(self._order, self.n_lags, out=self._order)
+        np.take(
+            self.ring,
+            self._order,
+            axis=1,
+            out=self.rows[:, : self.n_lags],
+        )
+
+    def select(self, keep: np.ndarray) -> None:
+        """Drop the series where ``keep`` is False."""
+        self.rows = self.rows[keep]
+        self.ring = self.ring[keep]
+
+
+def recursive_forecast(
+    predict,
+    seed: np.ndarray,
+    n_lags: int,
+    n_steps: int,
+    csn_step: float = 1.0,
+    noise: np.ndarray | None = None,
+    on_step=None,
+) -> np.ndarray:
+    """Feed each prediction back into the lags for ``n_steps`` cycles.
+
+    ``seed`` is one feature row (or one per series); returns an
+    (n_series, n_steps) array, with CSN advancing every cycle. An
+    (n_series, n_steps) ``noise`` array is added to each prediction
+    before it is fed back, to simulate sample paths. ``on_step`` is
+    called after every cycle.
+    """
+    lags = LagRing(seed, n_lags)
+    rows = lags.rows
+    out = np.empty(
+        (rows.shape[0], n_steps), dtype=np.float32
+    )
+    for step in range(n_steps):
+        out[:, step] = predict(rows)
+        if noise is not None:
+            out[:, step] += noise[:, step]
+        lags.push(out[:, step])
+        rows[:, -1] += csn_step
+        if on_step is not None:
+            on_step()
+    return out
+
+
+def cycles_to_limit(
+    predict,
+    seed: np.ndarray,
+    n_lags: int,
+    limit: float,
+    max_cycles: int,
+    csn_step: float = 1.0,
+    on_step=None,
+) -> np.ndarray:
+    """Forecast cycles until each series first drops to ``limit``.
+
+    Runs the same recursion as ``recursive_forecast`` but drops a
+    series from the batch as soon as it crosses, and stops once every
+    series has; series still above ``limit`` after ``max_cycles`` get
+    ``inf``. ``predict(rows, active)`` scores the rows of the series
+    still running, ``active`` holding their original indices.
+    """
+    lags = LagRing(seed, n_lags)
+    cycles = np.full(lags.rows.shape[0], np.inf)
+    active = np.arange(lags.rows.shape[0])
+    for cycle in range(1, max_cycles + 1):
+        values = np.asarray(
+            predict(lags.rows, active), np.float32
+        )
+        crossed = values <= limit
+        if crossed.any():
+            cycles[active[crossed]] = cycle
+            keep = ~crossed
+            active = active[keep]
+            if not len(active):
+                break
+            lags.select(keep)
+            values = values[keep]
+        lags.push(values)
+        lags.rows[:, -1] += csn_step
+        if on_step is not None:
+            on_step()
+    return cycles
\ No newline at end of file
@@ -0,0 +1,58 @@
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_ROOT = Path(
+    os.environ.get("EGT_CACHE_DIR", ".cache/egt")
+)
+
+
+def cache_dir(name: str) -> Path:
+    path = CACHE_ROOT / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def atomic_write(path: Path, write) -> None:
+    """Call ``write(tmp_path)`` and move the result into place."""
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=".tmp-", suffix=path.suffix
+    )
+    os.close(fd)
+    try:
+        write(Path(tmp_name))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def evict_lru(
+    directory: Path, max_bytes: int, pattern: str = "*"
+) -> list[Path]:
+    """Delete least recently used files until the directory fits."""
+    entries = []
+    for path in directory.glob(pattern):
+        if path.name.startswith(".tmp-"):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        evicted.append(path)
+    return evicted
\ No newline at end of file
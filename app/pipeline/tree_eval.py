@@ -0,0 +1,307 @@
+import json
+
+import numpy as np
+
+
+def _parse_base_score(raw: str) -> float:
+    return float(str(raw).strip("[]").split(",")[0])
+
+
+class TreeEnsemble:
+    """Array-backed copy of a trained XGBoost regression booster.
+
+    All trees are flattened into shared node arrays so a prediction is
+    ``depth`` vectorised steps over every tree at once, without the
+    per-call overhead of ``XGBRegressor.predict``.
+    """
+
+    def __init__(
+        self,
+        left: np.ndarray,
+        right: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        default_left: np.ndarray,
+        roots: np.ndarray,
+        base_score: float,
+        depth: int,
+    ):
+        nodes = np.arange(len(left))
+        leaf = left < 0
+        # Leaves point back at themselves so every row can take exactly
+        # ``depth`` steps without checking where it has stopped.
+        self.children = np.empty(2 * len(left), np.int64)
+        self.children[0::2] = np.where(leaf, nodes, left)
+        self.children[1::2] = np.where(leaf, nodes, right)
+        self.feature = np.where(leaf, 0, feature)
+        self.threshold = threshold
+        self.default_right = ~default_left & ~leaf
+        self.roots = roots
+        self.base_score = np.float32(base_score)
+        self.depth = depth
+        self.group_starts = None
+
+    @classmethod
+    def from_booster(
+        cls,
+        booster,
+        iteration_range: tuple[int, int] | None = None,
+    ) -> "TreeEnsemble":
+        model = json.loads(
+            booster.save_raw(raw_format="json")
+        )
+        learner = model["learner"]
+        params = learner["learner_model_param"]
+        if int(params.get("num_target", "1")) != 1:
+            raise ValueError(
+                "Only single-target boosters are supported."
+            )
+        objective = learner["objective"]["name"]
+        if objective not in (
+            "reg:squarederror",
+            "reg:absoluteerror",
+            "reg:quantileerror",
+            "reg:pseudohubererror",
+        ):
+            raise ValueError(
+                f"Unsupported objective: {objective}"
+            )
+        gbm = learner["gradient_booster"]["model"]
+        trees = gbm["trees"]
+        if iteration_range is not None:
+            indptr = gbm["iteration_indptr"]
+            start, stop = iteration_range
+            trees = trees[indptr[start] : indptr[stop]]
+        lefts, rights, features, thresholds, defaults = (
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+        roots = []
+        offset = 0
+        depth = 0
+        for tree in trees:
+            left = np.asarray(
+                tree["left_children"], np.int64
+            )
+            right = np.asarray(
+                tree["right_children"], np.int64
+            )
+            internal = left >= 0
+            roots.append(offset)
+            lefts.append(
+                np.where(internal, left + offset, -1)
+            )
+            rights.append(
+                np.where(internal, right + offset, -1)
+            )
+            features.append(
+                np.asarray(tree["split_indices"], np.int64)
+            )
+            thresholds.append(
+                np.asarray(
+                    tree["split_conditions"], np.float32
+                )
+            )
+            defaults.append(
+                np.asarray(tree["default_left"], bool)
+            )
+            depth = max(depth, _tree_depth(left, right))
+            offset += len(left)
+        if not trees:
+            empty = np.empty(0, np.int64)
+            return cls(
+                empty,
+                empty,
+                empty,
+                np.empty(0, np.float32),
+                np.empty(0, bool),
+                empty,
+                _parse_base_score(params["base_score"]),
+                0,
+            )
+        return cls(
+            np.concatenate(lefts),
+            np.concatenate(rights),
+            np.concatenate(features),
+            np.concatenate(thresholds),
+            np.concatenate(defaults),
+            np.asarray(roots, np.int64),
+            _parse_base_score(params["base_score"]),
+            depth,
+        )
+
+    @classmethod
+    def from_model(cls, model) -> "TreeEnsemble":
+        best = getattr(model, "best_iteration", None)
+        return cls.from_booster(
+            model.get_booster(),
+            None if best is None else (0, best + 1),
+        )
+
+    @classmethod
+    def stack(
+        cls, ensembles: list["TreeEnsemble"]
+    ) -> "TreeEnsemble":
+        """Combine ensembles so one pass predicts all of them.
+
+        ``predict`` on the result returns one column per member.
+        """
+        stacked = cls.__new__(cls)
+        node_offsets = np.cumsum(
+            [0] + [len(e.feature) for e in ensembles[:-1]]
+        )
+        stacked.children = np.concatenate(
+            [
+                e.children + offset
+                for e, offset in zip(
+                    ensembles, node_offsets
+                )
+            ]
+        )
+        stacked.feature = np.concatenate(
+            [e.feature for e in ensembles]
+        )
+        stacked.threshold = np.concatenate(
+            [e.threshold for e in ensembles]
+        )
+        stacked.default_right = np.concatenate(
+            [e.default_right for e in ensembles]
+        )
+        stacked.roots = np.concatenate(
+            [
+                e.roots + offset
+                for e, offset in zip(
+                    ensembles, node_offsets
+                )
+            ]
+        )
+        stacked.base_score = np.array(
+            [e.base_score for e in ensembles], np.float32
+        )
+        stacked.depth = max(e.depth for e in ensembles)
+        stacked.group_starts = np.cumsum(
+            [0] + [len(e.roots) for e in ensembles[:-1]]
+        )
+        return stacked
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[0] == 1:
+            return self._sum_leaves(
+                self._walk_row(X[0])[None, :]
+            )
+        has_missing = np.isnan(X).any()
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(
+            self.roots, (X.shape[0], len(self.roots))
+        )
+        for _ in range(self.depth):
+            values = X[rows, self.feature[nodes]]
+            go_right = values >= self.threshold[nodes]
+            if has_missing:
+                missing = np.isnan(values)
+                go_right[missing] = self.default_right[
+                    nodes[missing]
+                ]
+            nodes = self.children[2 * nodes + go_right]
+        return self._sum_leaves(nodes)
+
+    def predict_members(
+        self,
+        X: np.ndarray,
+        members: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Score row ``i`` with member ``i`` of a stacked ensemble only.
+
+        One walk over every tree once, instead of every member on every
+        row; used to advance one forecast path per ensemble member.
+        With ``members`` (sorted indices), row ``i`` is scored by member
+        ``members[i]`` and the other members are skipped.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        bounds = np.append(
+            self.group_starts, len(self.roots)
+        )
+        tree_members = np.repeat(
+            np.arange(len(self.group_starts)),
+            np.diff(bounds),
+        )
+        roots = self.roots
+        group_starts = self.group_starts
+        base_score = self.base_score
+        if members is not None:
+            selected = np.isin(tree_members, members)
+            roots = roots[selected]
+            tree_members = np.searchsorted(
+                members, tree_members[selected]
+            )
+            sizes = np.diff(bounds)[members]
+            group_starts = np.cumsum(
+                np.append(0, sizes[:-1])
+            )
+            base_score = base_score[members]
+        has_missing = np.isnan(X).any()
+        nodes = roots
+        for _ in range(self.depth):
+            values = X[tree_members, self.feature[nodes]]
+            go_right = values >= self.threshold[nodes]
+            if has_missing:
+                missing = np.isnan(values)
+                go_right[missing] = self.default_right[
+                    nodes[missing]
+                ]
+            nodes = self.children[2 * nodes + go_right]
+        return (
+            np.add.reduceat(
+                self.threshold[nodes], group_starts
+            )
+            + base_score
+        )
+
+    def _walk_row(self, x: np.ndarray) -> np.ndarray:
+        has_missing = np.isnan(x).any()
+        nodes = self.roots
+        for _ in range(self.depth):
+            values = x[self.feature[nodes]]
+            go_right = values >= self.threshold[nodes]
+            if has_missing:
+                missing = np.isnan(values)
+                go_right[missing] = self.default_right[
+                    nodes[missing]
+                ]
+            nodes = self.children[2 * nodes + go_right]
+        return nodes
+
+    def _sum_leaves(self, nodes: np.ndarray) -> np.ndarray:
+        leaves = self.threshold[nodes]
+        if self.group_starts is None:
+            return (
+                leaves.sum(axis=1, dtype=np.float32)
+                + self.base_score
+            )
+        return (
+            np.add.reduceat(
+                leaves, self.group_starts, axis=1
+            )
+            + self.base_score
+        )
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = 0
+    level = [0]
+    while True:
+        level = [
+            child
+            for node in level
+            if left[node] >= 0
+            for child in (left[node], right[node])
+        ]
+        if not level:
+            return depth
+        depth += 1
\ No newline at end of file
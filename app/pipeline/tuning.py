@@ -0,0 +1,362 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.features import (
+    EXOGENOUS_COLUMNS,
+    LagMatrix,
+    build_lag_matrix,
+)
+from app.pipeline.ingest import load_flight_log
+from app.pipeline.model import make_model
+from app.pipeline.parse_cache import (
+    file_digest,
+    remember_digest,
+)
+from app.pipeline.recursive import recursive_forecast
+from app.pipeline.storage import atomic_write, cache_dir
+from app.pipeline.tree_eval import TreeEnsemble
+
+DEFAULT_LAGS = 30
+TUNING_LAGS = (10, 20, 30, 45, 60)
+SEARCH_SPACE = {
+    "max_depth": (3, 4, 6, 8),
+    "learning_rate": (0.03, 0.1, 0.3),
+    "min_child_weight": (1, 5, 10),
+    "subsample": (0.7, 0.85, 1.0),
+    "colsample_bytree": (0.7, 1.0),
+}
+TUNING_CANDIDATES = int(
+    os.environ.get("EGT_TUNING_CANDIDATES", 24)
+)
+TUNING_FOLDS = 3
+TUNING_HORIZON = 200
+MAX_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 30
+EARLY_STOPPING_FRACTION = 0.1
+# A candidate whose running error exceeds the best finished one by this
+# factor skips its remaining folds.
+PRUNE_RATIO = 1.5
+# Bumped when the scoring changes, e.g. the recursion's lag order.
+TUNING_VERSION = 2
+
+
+@dataclass
+class Candidate:
+    n_lags: int
+    params: dict = field(default_factory=dict)
+
+
+@dataclass
+class TunedConfig:
+    engine: str
+    n_lags: int
+    params: dict
+    score: float
+    default_score: float
+    candidates: int
+    rows: int
+    data_key: str
+    tuned_at: str
+
+
+def candidate_grid(
+    n_candidates: int = TUNING_CANDIDATES, seed: int = 0
+) -> list[Candidate]:
+    """The default configuration plus distinct random draws."""
+    rng = np.random.default_rng(seed)
+    candidates = [Candidate(DEFAULT_LAGS)]
+    seen = {(DEFAULT_LAGS, ())}
+    space_size = len(TUNING_LAGS) * int(
+        np.prod([len(v) for v in SEARCH_SPACE.values()])
+    )
+    while len(candidates) < min(n_candidates, space_size):
+        n_lags = int(rng.choice(TUNING_LAGS))
+        params = {
+            name: values[rng.integers(len(values))]
+            for name, values in SEARCH_SPACE.items()
+        }
+        marker = (n_lags, tuple(sorted(params.items())))
+        if marker not in seen:
+            seen.add(marker)
+            candidates.append(Candidate(n_lags, params))
+    return candidates
+
+
+def lag_columns(max_lags: int, n_lags: int) -> np.ndarray:
+    """Columns of the widest lag matrix that form an ``n_lags`` one."""
+    return np.r_[
+        0:n_lags,
+        max_lags : max_lags + len(EXOGENOUS_COLUMNS),
+    ]
+
+
+def walk_forward_folds(
+    n_rows: int,
+    n_folds: int = TUNING_FOLDS,
+    horizon: int = TUNING_HORIZON,
+) -> list[tuple[int, int]]:
+    """``(train_end, validation_end)`` pairs on an expanding window."""
+    size = min(horizon, n_rows // (n_folds + 2))
+    if size < 1:
+        return []
+    return [
+        (
+            n_rows - (n_folds - k) * size,
+            n_rows - (n_folds - k - 1) * size,
+        )
+        for k in range(n_folds)
+    ]
+
+
+def _fit_fold(X: np.ndarray, y: np.ndarray, params: dict):
+    split = max(
+        1, int(len(y) * (1 - EARLY_STOPPING_FRACTION))
+    )
+    model = make_model(
+        **{
+            "n_estimators": MAX_ROUNDS,
+            "early_stopping_rounds": EARLY_STOPPING_ROUNDS,
+            "n_jobs": 1,
+            **params,
+        }
+    )
+    model.fit(
+        X[:split],
+        y[:split],
+        eval_set=[(X[split:], y[split:])],
+        verbose=False,
+    )
+    return model
+
+
+class _Search:
+    def __init__(
+        self,
+        matrix: LagMatrix,
+        folds: list[tuple[int, int]],
+        report,
+        total: int,
+    ):
+        self.matrix = matrix
+        self.folds = folds
+        self.report = report
+        self.total = total
+        self.best = float("inf")
+        self.done = 0
+        self._lock = threading.Lock()
+
+    def evaluate(self, candidate: Candidate):
+        """Mean recursive RMSE over the folds and the rounds used."""
+        X = self.matrix.X[
+            :,
+            lag_columns(
+                self.matrix.n_lags, candidate.n_lags
+            ),
+        ]
+        y = self.matrix.y
+        errors, rounds = [], []
+        for train_end, valid_end in self.folds:
+            model = _fit_fold(
+                X[:train_end],
+                y[:train_end],
+                candidate.params,
+            )
+            rounds.append(model.best_iteration + 1)
+            path = recursive_forecast(
+                TreeEnsemble.from_model(model).predict,
+                X[train_end],
+                candidate.n_lags,
+                valid_end - train_end,
+            )[0]
+            errors.append(
+                float(
+                    np.sqrt(
+                        np.mean(
+                            (path - y[train_end:valid_end])
+                            ** 2
+                        )
+                    )
+                )
+            )
+            if np.mean(errors) > PRUNE_RATIO * self.best:
+                score = float("inf")
+                break
+        else:
+            score = float(np.mean(errors))
+        with self._lock:
+            self.best = min(self.best, score)
+            self.done += 1
+            self.report(
+                f"Validation croisée : {self.done}/{self.total} configurations..."
+            )
+        return score, int(np.mean(rounds))
+
+
+def tune_frame(
+    df: pd.DataFrame,
+    data_key: str,
+    engine: str,
+    n_candidates: int = TUNING_CANDIDATES,
+    n_folds: int = TUNING_FOLDS,
+    horizon: int = TUNING_HORIZON,
+    report=None,
+    max_workers: int | None = None,
+    seed: int = 0,
+) -> TunedConfig:
+    """Random search over lag windows and booster parameters.
+
+    The widest lag matrix is built once and every candidate trains on
+    a column slice of it, so all of them are scored on the same rows.
+    """
+    report = report or (lambda message: None)
+    candidates = candidate_grid(n_candidates, seed)
+    report("Création des caractéristiques lag...")
+    matrix = build_lag_matrix(
+        df, max(c.n_lags for c in candidates)
+    )
+    folds = walk_forward_folds(
+        len(matrix), n_folds, horizon
+    )
+    if not folds:
+        raise ValueError(
+            "Pas assez de données pour la validation croisée."
+        )
+    search = _Search(matrix, folds, report, len(candidates))
+    # The default runs first so pruning has a reference from the start.
+    scores = {0: search.evaluate(candidates[0])}
+    with ThreadPoolExecutor(
+        max_workers or os.cpu_count() or 1
+    ) as pool:
+        futures = {
+            pool.submit(search.evaluate, candidate): index
+            for index, candidate in enumerate(candidates)
+            if index
+        }
+        for future in as_completed(futures):
+            scores[futures[future]] = future.result()
+    best = min(scores, key=lambda index: scores[index][0])
+    score, rounds = scores[best]
+    return TunedConfig(
+        engine=engine,
+        n_lags=candidates[best].n_lags,
+        params={
+            **candidates[best].params,
+            "n_estimators": rounds,
+        },
+        score=score,
+        default_score=scores[0][0],
+        candidates=len(candidates),
+        rows=len(df),
+        data_key=data_key,
+        tuned_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+class TuningStore:
+    """Best configuration found for each flight log, one JSON file each.
+
+    Files are keyed by engine and by the digest of the data that was
+    tuned, so two sessions uploading different logs under the same
+    name never share a configuration, and a log that has since grown
+    is tuned again. They also carry ``TUNING_VERSION`` so
+    configurations scored by an older forecast recursion are not
+    reused.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self.directory = directory or cache_dir("tuning")
+
+    def _path(self, engine: str, data_key: str) -> Path:
+        digest = hashlib.sha256(
+            f"{engine}\0{data_key}".encode()
+        ).hexdigest()
+        return (
+            self.directory
+            / f"{digest[:32]}-v{TUNING_VERSION}.json"
+        )
+
+    def get(
+        self,
+        engine: str,
+        data_key: str,
+        rows: int | None = None,
+    ) -> TunedConfig | None:
+        try:
+            raw = json.loads(
+                self._path(engine, data_key).read_text()
+            )
+            config = TunedConfig(**raw)
+        except (FileNotFoundError, TypeError, ValueError):
+            return None
+        if config.data_key != data_key or (
+            rows is not None and config.rows != rows
+        ):
+            return None
+        return config
+
+    def put(self, config: TunedConfig) -> None:
+        payload = json.dumps(asdict(config))
+        atomic_write(
+            self._path(config.engine, config.data_key),
+            lambda tmp: tmp.write_text(payload),
+        )
+
+
+_default_store: TuningStore | None = None
+
+
+def get_tuning_store() -> TuningStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = TuningStore()
+    return _default_store
+
+
+@dataclass
+class TuningRequest:
+    file_path: Path
+    engine: str | None = None
+    n_candidates: int = TUNING_CANDIDATES
+    digest: str | None = None
+
+
+def run_tuning(
+    request: TuningRequest, report=lambda message: None
+) -> TunedConfig:
+    """Tune one flight log and remember the result for its data."""
+    if request.digest:
+        remember_digest(request.file_path, request.digest)
+    df = load_flight_log(request.file_path)
+    config = tune_frame(
+        df,
+        file_digest(request.file_path),
+        request.engine or Path(request.file_path).stem,
+        request.n_candidates,
+        report=report,
+    )
+    get_tuning_store().put(config)
+    return config
+
+
+if __name__ == "__main__":
+    import sys
+
+    for arg in sys.argv[1:]:
+        tuned = run_tuning(TuningRequest(Path(arg)), print)
+        print(
+            f"{tuned.engine}: n_lags={tuned.n_lags} "
+            f"{tuned.params} RMSE {tuned.score:.3f} "
+            f"(default {tuned.default_score:.3f})"
+        )
\ No newline at end of file
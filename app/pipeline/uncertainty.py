@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.pipeline.model import MODEL_PARAMS
+from app.pipeline.progress import (
+    ProgressReporter,
+    boosting_callback,
+)
+from app.pipeline.recursive import recursive_forecast
+from app.pipeline.tree_eval import TreeEnsemble
+
+ENSEMBLE_SIZE = int(os.environ.get("EGT_ENSEMBLE_SIZE", 16))
+BAND_QUANTILES = (0.1, 0.9)
+
+
+def booster_params(seed: int) -> dict:
+    """``MODEL_PARAMS`` translated for ``xgb.train``."""
+    params = {
+        key: value
+        for key, value in MODEL_PARAMS.items()
+        if key not in ("n_estimators", "random_state")
+    }
+    params.update(
+        seed=MODEL_PARAMS.get("random_state", 0) + seed,
+        nthread=1,
+        verbosity=0,
+    )
+    return params
+
+
+class BootstrapEnsemble:
+    """Boosters trained on bootstrap resamples of one lag matrix.
+
+    Each member also keeps its out-of-bag residuals, which are drawn
+    as noise along its forecast path so the bands reflect both model
+    and observation uncertainty.
+    """
+
+    def __init__(
+        self,
+        ensemble: TreeEnsemble,
+        residuals: list[np.ndarray],
+    ):
+        self.ensemble = ensemble
+        self.residuals = residuals
+
+    def __len__(self) -> int:
+        return len(self.residuals)
+
+    @classmethod
+    def fit(
+        cls,
+        X: np.ndarray,
+        y: np.ndarray,
+        n_members: int = ENSEMBLE_SIZE,
+        max_workers: int | None = None,
+        seed: int = 0,
+        progress: ProgressReporter | None = None,
+    ) -> "BootstrapEnsemble":
+        import xgboost as xgb
+
+        rng = np.random.default_rng(seed)
+        # Poisson(1) weights are the streaming form of resampling with
+        # replacement: every member sees the same rows, only weighted.
+        weights = rng.poisson(
+            1.0, (n_members, len(y))
+        ).astype(np.float32)
+        # The histogram cuts are sketched once and shared; members
+        # only re-bin the rows against them.
+        reference = xgb.QuantileDMatrix(X, y)
+        n_rounds = MODEL_PARAMS.get("n_estimators", 100)
+
+        def fit_one(member: int):
+            train = xgb.QuantileDMatrix(
+                X, y, weight=weights[member], ref=reference
+            )
+            booster = xgb.train(
+                booster_params(member),
+                train,
+                num_boost_round=n_rounds,
+                callbacks=(
+                    [boosting_callback(progress)]
+                    if progress is not None
+                    else None
+                ),
+            )
+            ensemble = TreeEnsemble.from_booster(booster)
+            out_of_bag = weights[member] == 0
+            residuals = y[out_of_bag] - ensemble.predict(
+                X[out_of_bag]
+            )
+            return ensemble, residuals
+
+        with ThreadPoolExecutor(
+            max_workers or os.cpu_count() or 1
+        ) as pool:
+            members = list(
+                pool.map(fit_one, range(n_members))
+            )
+        return cls(
+            TreeEnsemble.stack([m[0] for m in members]),
+            [m[1] for m in members],
+        )
+
+    def forecast(
+        self,
+        seed_row: np.ndarray,
+        n_lags: int,
+        n_steps: int,
+        seed: int = 0,
+        on_step=None,
+    ) -> np.ndarray:
+        """One recursive sample path per member, (n_members, n_steps)."""
+        rng = np.random.default_rng(seed)
+        noise = np.stack(
+            [
+                (
+                    rng.choice(residuals, n_steps)
+                    if len(residuals)
+                    else np.zeros(n_steps)
+                )
+                for residuals in self.residuals
+            ]
+        )
+        return recursive_forecast(
+            self.ensemble.predict_members,
+            np.tile(seed_row, (len(self), 1)),
+            n_lags,
+            n_steps,
+            noise=noise,
+            on_step=on_step,
+        )
+
+
+def prediction_bands(
+    paths: np.ndarray, quantiles=BAND_QUANTILES
+) -> np.ndarray:
+    """Per-step quantiles of the sample paths, (len(quantiles), n_steps)."""
+    return np.quantile(paths, quantiles, axis=0)
\ No newline at end of file
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.pipeline.parse_cache import remember_digest
+from app.pipeline.storage import (
+    atomic_write,
+    cache_dir,
+    touch,
+)
+
+UPLOAD_MAX_BYTES = int(
+    os.environ.get("EGT_UPLOAD_MAX_BYTES", 5 * 1024**3)
+)
+UPLOAD_SESSION_TTL_SECONDS = float(
+    os.environ.get(
+        "EGT_UPLOAD_SESSION_TTL_SECONDS", 24 * 3600
+    )
+)
+UPLOAD_JANITOR_SECONDS = float(
+    os.environ.get("EGT_UPLOAD_JANITOR_SECONDS", 300)
+)
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+_INDEX_NAME = ".index.json"
+
+
+def _session_key(session: str) -> str:
+    # Client tokens are not safe directory names.
+    return hashlib.sha256(session.encode()).hexdigest()[:32]
+
+
+def _write_chunk(hasher, outfile, chunk: bytes) -> None:
+    hasher.update(chunk)
+    outfile.write(chunk)
+
+
+class UploadStore:
+    """Uploaded workbooks stored once per content hash.
+
+    Bytes live in ``blobs/<sha256><suffix>``. Each session sees its
+    files under their original names through hard links in
+    ``sessions/<session>/``, so two users uploading ``engine.xlsx``
+    never collide and identical files are stored once. ``collect``
+    drops idle sessions and evicts least recently used blobs, the
+    unreferenced ones first, until the store fits ``max_bytes``.
+
+    Blob recency is kept on empty marker files in ``used/`` rather
+    than on the blobs, whose mtime is shared with every link and keys
+    the parse cache's digest memo. Each session's ``.index.json`` maps
+    its file names to their blobs so the hash is never recomputed.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int = UPLOAD_MAX_BYTES,
+        session_ttl_seconds: float = UPLOAD_SESSION_TTL_SECONDS,
+    ):
+        directory = directory or cache_dir("uploads")
+        self.blobs = directory / "blobs"
+        self.sessions = directory / "sessions"
+        self.used = directory / "used"
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        self.sessions.mkdir(parents=True, exist_ok=True)
+        self.used.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.session_ttl_seconds = session_ttl_seconds
+        self._lock = threading.Lock()
+
+    def session_dir(self, session: str) -> Path:
+        return self.sessions / _session_key(session)
+
+    async def save(self, session: str, upload) -> Path:
+        """Stream an ``UploadFile`` to disk and link it into the session.
+
+        Hashing, writing and linking run in worker threads so a large
+        upload does not stall the event loop between chunks.
+        """
+        name = Path(upload.name).name
+        hasher = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.blobs, prefix=".tmp-"
+        )
+        try:
+            with os.fdopen(fd, "wb") as outfile:
+                while chunk := await upload.read(
+                    UPLOAD_CHUNK_BYTES
+                ):
+                    await asyncio.to_thread(
+                        _write_chunk, hasher, outfile, chunk
+                    )
+            blob = self.blobs / (
+                hasher.hexdigest()
+                + Path(name).suffix.lower()
+            )
+            return await asyncio.to_thread(
+                self._store, session, name, blob, tmp_name
+            )
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def _store(
+        self,
+        session: str,
+        name: str,
+        blob: Path,
+        tmp_name: str,
+    ) -> Path:
+        with self._lock:
+            if not blob.exists():
+                os.replace(tmp_name, blob)
+            (self.used / blob.name).touch()
+            return self._link(session, name, blob)
+
+    def _link(
+        self, session: str, name: str, blob: Path
+    ) -> Path:
+        target = self.session_dir(session)
+        target.mkdir(exist_ok=True)
+        path = target / name
+        path.unlink(missing_ok=True)
+        try:
+            os.link(blob, path)
+        except OSError:
+            # File systems without hard links get a private copy.
+            shutil.copyfile(blob, path)
+        index = self._index(target)
+        index[name] = blob.name
+        payload = json.dumps(index)
+        atomic_write(
+            target / _INDEX_NAME,
+            lambda tmp: tmp.write_text(payload),
+        )
+        return path
+
+    def _index(self, target: Path) -> dict[str, str]:
+        try:
+            return json.loads(
+                (target / _INDEX_NAME).read_text()
+            )
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def digest(self, session: str, name: str) -> str | None:
+        """The sha256 of the session's ``name``, from its blob name."""
+        blob = self._index(self.session_dir(session)).get(
+            Path(name).name
+        )
+        return Path(blob).stem if blob else None
+
+    def resolve(self, session: str, name: str) -> Path:
+        """The session's copy of ``name``, marked as recently used.
+
+        The path no longer exists once the session expired or its blob
+        was evicted; reading it then raises FileNotFoundError.
+        """
+        target = self.session_dir(session)
+        path = target / Path(name).name
+        blob = self._index(target).get(path.name)
+        touch(target)
+        if blob and path.exists():
+            touch(self.used / blob)
+            remember_digest(path, Path(blob).stem)
+        return path
+
+    def collect(self) -> int:
+        """Expire idle sessions, then evict blobs over the quota."""
+        cutoff = time.time() - self.session_ttl_seconds
+        removed = 0
+        with self._lock:
+            for target in self.sessions.iterdir():
+                try:
+                    idle = target.stat().st_mtime < cutoff
+                except FileNotFoundError:
+                    continue
+                if idle:
+                    shutil.rmtree(
+                        target, ignore_errors=True
+                    )
+            entries = []
+            for blob in self.blobs.iterdir():
+                if blob.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = blob.stat()
+                except FileNotFoundError:
+                    continue
+                try:
+                    used = (
+                        (self.used / blob.name)
+                        .stat()
+                        .st_mtime
+                    )
+                except FileNotFoundError:
+                    used = stat.st_mtime
+                entries.append(
+                    (
+                        stat.st_nlink > 1,
+                        used,
+                        stat.st_size,
+                        blob,
+                    )
+                )
+            total = sum(entry[2] for entry in entries)
+            for referenced, _, size, blob in sorted(
+                entries
+            ):
+                if total <= self.max_bytes:
+                    break
+                if referenced:
+                    self._unlink_references(blob)
+                blob.unlink(missing_ok=True)
+                (self.used / blob.name).unlink(
+                    missing_ok=True
+                )
+                total -= size
+                removed += 1
+        return removed
+
+    def _unlink_references(self, blob: Path) -> None:
+        inode = blob.stat().st_ino
+        for path in self.sessions.glob("*/*"):
+            try:
+                if path.stat().st_ino == inode:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+    def start_janitor(
+        self, interval: float = UPLOAD_JANITOR_SECONDS
+    ) -> threading.Thread:
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.collect()
+                except OSError:
+                    pass
+
+        thread = threading.Thread(
+            target=loop, name="upload-janitor", daemon=True
+        )
+        thread.start()
+        return thread
+
+
+_default_store: UploadStore | None = None
+
+
+def get_upload_store() -> UploadStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = UploadStore()
+        _default_store.start_janitor()
+    return _default_store
\ No newline at end of file
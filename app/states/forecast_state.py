@@ -1,41 +1,171 @@
 import reflex as rx
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import io
-import json
 import asyncio
+from app.pipeline.artifacts import get_artifact_store
+from app.pipeline.backends import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    available_backends,
+)
+from app.pipeline.chart_series import (
+    CHART_POINT_BUDGET,
+    FORECAST_KEY,
+    LOWER_KEY,
+    RISK_THRESHOLD,
+    UPPER_KEY,
+    forecast_columns,
+    reload_chart_series,
+)
+from app.pipeline.exports import (
+    available_formats,
+    get_export_cache,
+)
+from app.pipeline.engine import (
+    LIMIT_MAX_CYCLES,
+    ForecastRequest,
+    InsufficientDataError,
+    run_pipeline,
+)
+from app.pipeline.fleet import (
+    CYCLES_COLUMN,
+    LIMIT_DATE_COLUMN,
+    FleetRun,
+    get_fleet_executor,
+    partition_engines,
+    screen_fleet,
+)
+from app.pipeline.jobs import (
+    JobCancelled,
+    JobRejected,
+    get_executor,
+)
+from app.pipeline.metrics import (
+    SpanRecorder,
+    record_spans,
+)
+from app.pipeline.progress import (
+    PROGRESS_PUSHES_PER_SECOND,
+    Progress,
+)
+from app.pipeline.tuning import TuningRequest, run_tuning
+from app.pipeline.uploads import get_upload_store
 
-try:
-    from xgboost import XGBRegressor
+JOB_POLL_SECONDS = 1 / PROGRESS_PUSHES_PER_SECOND
+_active_fleet_runs: dict[str, FleetRun] = {}
 
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
 
-    class XGBRegressor:
+STAGE_LABELS = {
+    "upload": "Réception des fichiers",
+    "parse": "Lecture Excel",
+    "lag_features": "Caractéristiques lag",
+    "train": "Entraînement",
+    "forecast": "Prévision",
+    "chart": "Préparation du graphique",
+    "ensemble": "Ensemble bootstrap (P10/P90)",
+    "limit": "Cycles jusqu'au seuil",
+    "export": "Génération de l'export",
+    "read": "Lecture de l'export",
+}
+
+
+def _timing_rows(spans) -> list[dict[str, str]]:
+    return [
+        {
+            "stage": STAGE_LABELS.get(span.name, span.name),
+            "seconds": f"{span.seconds:.2f} s",
+            "rows": (
+                ""
+                if span.rows is None
+                else f"{span.rows:,}"
+            ),
+            "memory": (
+                ""
+                if span.peak_memory_bytes is None
+                else f"{span.peak_memory_bytes / 1024**2:.0f} Mo"
+            ),
+        }
+        for span in spans
+    ]
+
+
+def _progress_view(
+    progress: Progress | None,
+) -> tuple[int, str]:
+    """Percentage (-1 when unknown) and remaining-time label."""
+    if progress is None or progress.fraction is None:
+        return -1, ""
+    percent = int(progress.fraction * 100)
+    eta = progress.eta_seconds
+    if eta is None:
+        return percent, f"{percent} %"
+    if eta < 60:
+        remaining = f"{eta:.0f} s"
+    else:
+        remaining = f"{eta / 60:.0f} min"
+    return (
+        percent,
+        f"{percent} % · environ {remaining} restantes",
+    )
 
-        def __init__(self, *args, **kwargs):
-            print(
-                "Warning: XGBoost not found. Using dummy regressor."
-            )
 
-        def fit(self, X, y):
-            print("Dummy XGBRegressor: Fit called.")
+def _limit_summary(result, limit: float) -> str:
+    if result.cycles_to_limit is None:
+        return ""
+    if result.limit_date is None:
+        return f"Marge au-dessus de {limit:g} °C sur les {result.limit_horizon} prochains cycles."
+    return (
+        f"Marge sous {limit:g} °C dans {result.cycles_to_limit:.0f} cycles"
+        f" (vers le {result.limit_date:%d/%m/%Y})."
+    )
+
 
-        def predict(self, X):
-            print("Dummy XGBRegressor: Predict called.")
-            return np.full(
-                X.shape[0],
-                25.0 + np.random.rand(X.shape[0]) * 5,
+def _fleet_rows(
+    records: list[dict], sort_key: str, descending: bool
+) -> list[dict[str, str]]:
+    """Fleet summary rows sorted on their raw values, then formatted."""
+    frame = pd.DataFrame(records)
+    if sort_key in frame.columns:
+        frame = frame.sort_values(
+            sort_key,
+            ascending=not descending,
+            na_position="last",
+            kind="stable",
+        )
+    rows = []
+    for record in frame.to_dict("records"):
+        row = {
+            name: _format_cell(value)
+            for name, value in record.items()
+        }
+        cycles = record.get("cycles_to_limit")
+        if cycles is not None and cycles == cycles:
+            row["cycles_to_limit"] = (
+                f"> {LIMIT_MAX_CYCLES}"
+                if np.isinf(cycles)
+                else f"{cycles:.0f}"
             )
+        rows.append(row)
+    return rows
+
+
+def _format_cell(value) -> str:
+    if value is None or value != value:
+        return ""
+    if isinstance(value, pd.Timestamp):
+        return f"{value:%Y-%m-%d}"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
 
 
 class ForecastState(rx.State):
     uploaded_file_name: str = ""
     is_processing: bool = False
     forecast_chart_data: list[dict[str, str | float]] = []
-    raw_forecast_df_json: str = ""
+    forecast_artifact_id: str = ""
+    # Model behind the charted forecast, as named in its columns.
+    forecast_model: str = ""
     show_chart: bool = False
     error_message: str | None = None
     status_message: str = (
@@ -43,6 +173,27 @@ class ForecastState(rx.State):
     )
     LAG_FEATURES: int = 30
     FORECAST_CYCLES: int = 200
+    forecast_strategy: str = "recursive"
+    job_id: str = ""
+    uploaded_file_names: list[str] = []
+    fleet_mode: bool = False
+    fleet_run_id: str = ""
+    fleet_summary: list[dict[str, str]] = []
+    CHART_POINTS: int = CHART_POINT_BUDGET
+    chart_start: str = ""
+    chart_end: str = ""
+    export_format: str = "xlsx"
+    stage_timings: list[dict[str, str]] = []
+    uncertainty_mode: bool = False
+    progress_percent: int = -1
+    progress_label: str = ""
+    margin_limit: float = RISK_THRESHOLD
+    limit_summary: str = ""
+    fleet_sort_key: str = "cycles_to_limit"
+    fleet_sort_desc: bool = False
+    ranking_artifact_id: str = ""
+    model_backend: str = DEFAULT_BACKEND
+    _fleet_records: list[dict] = []
 
     @rx.event
     async def handle_upload(
@@ -54,33 +205,53 @@ class ForecastState(rx.State):
             )
             self.status_message = "Échec du téléchargement."
             return
-        file = files[0]
-        if not file.name.endswith((".xlsx", ".xls")):
+        invalid = [
+            file.name
+            for file in files
+            if not file.name.endswith((".xlsx", ".xls"))
+        ]
+        if invalid:
             self.error_message = "Format de fichier invalide. Veuillez télécharger un fichier Excel (.xlsx ou .xls)."
             self.status_message = "Échec du téléchargement."
             return
         try:
-            upload_data = await file.read()
-            self.uploaded_file_name = file.name
-            self.status_message = f"Fichier '{file.name}' téléchargé. Prêt pour la prévision."
+            store = get_upload_store()
+            session = self.router.session.client_token
+            recorder = SpanRecorder()
+            with recorder.span("upload"):
+                for file in files:
+                    await store.save(session, file)
+            record_spans("upload", recorder.spans)
+            self.stage_timings = _timing_rows(
+                recorder.spans
+            )
+            self.uploaded_file_name = files[0].name
+            self.uploaded_file_names = [
+                file.name for file in files
+            ]
+            if len(files) == 1:
+                self.status_message = f"Fichier '{files[0].name}' téléchargé. Prêt pour la prévision."
+            else:
+                self.status_message = f"{len(files)} fichiers téléchargés. Prêt pour la prévision de flotte."
+                self.fleet_mode = True
             self.error_message = None
             self.show_chart = False
             self.forecast_chart_data = []
-            self.raw_forecast_df_json = ""
-            upload_dir = rx.get_upload_dir()
-            if not upload_dir.exists():
-                upload_dir.mkdir(
-                    parents=True, exist_ok=True
-                )
-            outfile_path = upload_dir / file.name
-            with open(outfile_path, "wb") as outfile:
-                outfile.write(upload_data)
+            self._discard_forecast()
+            self.fleet_summary = []
+            self._fleet_records = []
         except Exception as e:
             self.error_message = (
                 f"Erreur lors du téléchargement: {str(e)}"
             )
             self.status_message = "Échec du téléchargement."
 
+    @rx.event
+    def start_forecast(self):
+        if self.fleet_mode:
+            return ForecastState.run_fleet_forecast
+        return ForecastState.run_forecast
+
     @rx.event(background=True)
     async def run_forecast(self):
         async with self:
@@ -94,127 +265,249 @@ class ForecastState(rx.State):
             self.error_message = None
             self.status_message = "Traitement des données et entraînement du modèle..."
             self.forecast_chart_data = []
-            self.raw_forecast_df_json = ""
+            self.stage_timings = []
+            self._discard_forecast()
+            session = self.router.session.client_token
+            request = ForecastRequest(
+                self._upload_path(self.uploaded_file_name),
+                self.LAG_FEATURES,
+                self.FORECAST_CYCLES,
+                self.forecast_strategy,
+                self.CHART_POINTS,
+                self.uncertainty_mode,
+                limit=self.margin_limit,
+                backend=self.model_backend,
+                digest=self._upload_digest(
+                    self.uploaded_file_name
+                ),
+            )
+            self.limit_summary = ""
+            self.chart_start = ""
+            self.chart_end = ""
+        executor = get_executor()
         try:
-            file_path = (
-                rx.get_upload_dir()
-                / self.uploaded_file_name
+            job = executor.submit(
+                session, run_pipeline, request
+            )
+            async with self:
+                self.job_id = job.id
+            await self._follow_job(
+                executor,
+                job,
+                "Traitement des données et entraînement du modèle...",
             )
-            df = pd.read_excel(file_path, header=7)
-            df.dropna(how="all", inplace=True)
-            df["Flight DateTime"] = pd.to_datetime(
-                df["Flight DateTime"]
+            result = await asyncio.wrap_future(job.future)
+            record_spans("forecast", result.spans)
+            training_mode = result.training_mode
+            forecast_df = result.to_frame()
+            artifact_id = await asyncio.to_thread(
+                get_artifact_store().put, forecast_df
             )
-            df.set_index("Flight DateTime", inplace=True)
-            df.sort_index(inplace=True)
             async with self:
+                self.forecast_chart_data = result.chart_data
+                self.forecast_artifact_id = artifact_id
+                self.forecast_model = BACKENDS[
+                    result.backend
+                ].short_label
+                self.limit_summary = _limit_summary(
+                    result, request.limit
+                )
+                self.stage_timings = _timing_rows(
+                    result.spans
+                )
+                self.show_chart = True
                 self.status_message = (
-                    "Création des caractéristiques lag..."
+                    "Prévision terminée avec succès."
                 )
-            for i in range(1, self.LAG_FEATURES + 1):
-                df[f"lag_{i}"] = df["EGT Margin"].shift(i)
-            feature_cols = [
-                f"lag_{i}"
-                for i in range(1, self.LAG_FEATURES + 1)
-            ] + ["Vibration of the core", "CSN"]
-            target_col = "EGT Margin"
-            df_model = df[
-                feature_cols + [target_col]
-            ].copy()
-            df_model.dropna(inplace=True)
-            if df_model.empty:
-                async with self:
-                    self.error_message = "Pas assez de données après la préparation pour entraîner le modèle."
-                    self.status_message = (
-                        "Échec de la prévision."
+                self.error_message = None
+                if training_mode == "cached":
+                    self.status_message += (
+                        " Modèle existant réutilisé."
                     )
-                    self.is_processing = False
-                return
-            X = df_model[feature_cols]
-            y = df_model[target_col]
+                elif training_mode == "incremental":
+                    self.status_message += " Modèle mis à jour avec les nouveaux cycles."
+                if result.tuned:
+                    self.status_message += (
+                        " Configuration optimisée utilisée."
+                    )
+                if not BACKENDS[request.backend].boosted:
+                    self.status_message += f" Modèle utilisé : {BACKENDS[request.backend].label}."
+        except JobCancelled:
+            async with self:
+                self.status_message = "Prévision annulée."
+        except JobRejected as e:
             async with self:
+                self.error_message = str(e)
                 self.status_message = (
-                    "Entraînement du modèle XGBoost..."
+                    "Échec de la prévision."
                 )
-            model = XGBRegressor(
-                objective="reg:squarederror",
-                n_estimators=100,
-                random_state=42,
-            )
-            if not XGBOOST_AVAILABLE:
-                await asyncio.sleep(2)
-            model.fit(X, y)
-            if not XGBOOST_AVAILABLE:
-                await asyncio.sleep(1)
+        except InsufficientDataError as e:
+            async with self:
+                self.error_message = str(e)
+                self.status_message = (
+                    "Échec de la prévision."
+                )
+        except FileNotFoundError:
             async with self:
+                self.error_message = f"Fichier '{self.uploaded_file_name}' non trouvé. Veuillez le télécharger à nouveau."
                 self.status_message = (
-                    "Génération des prévisions..."
+                    "Échec de la prévision."
                 )
-            last_known_data = df_model.iloc[-1]
-            last_date = df_model.index[-1]
-            current_lags = last_known_data[
-                feature_cols[: self.LAG_FEATURES]
-            ].values.tolist()
-            current_vibration = last_known_data[
-                "Vibration of the core"
+        except KeyError as e:
+            async with self:
+                self.error_message = f"Colonne manquante dans le fichier Excel: {str(e)}. Vérifiez les en-têtes à la ligne 8."
+                self.status_message = (
+                    "Échec de la prévision."
+                )
+        except Exception as e:
+            import traceback
+
+            tb_str = traceback.format_exc()
+            async with self:
+                self.error_message = f"Une erreur est survenue: {str(e)}\n{tb_str}"
+                self.status_message = (
+                    "Échec de la prévision."
+                )
+        finally:
+            async with self:
+                self.is_processing = False
+                self.job_id = ""
+                self.progress_percent = -1
+                self.progress_label = ""
+
+    @rx.event(background=True)
+    async def run_fleet_forecast(self):
+        async with self:
+            if not self.uploaded_file_names:
+                self.error_message = "Aucun fichier n'a été téléchargé pour la prévision."
+                self.status_message = "Veuillez d'abord télécharger un fichier."
+                return
+            self.is_processing = True
+            self.show_chart = False
+            self.error_message = None
+            self.status_message = (
+                "Répartition des données par moteur..."
+            )
+            self.forecast_chart_data = []
+            self._discard_forecast()
+            self.fleet_summary = []
+            self._fleet_records = []
+            session = self.router.session.client_token
+            paths = [
+                self._upload_path(name)
+                for name in self.uploaded_file_names
             ]
-            current_csn = last_known_data["CSN"]
-            predictions = []
-            future_dates = []
-            for i in range(self.FORECAST_CYCLES):
-                input_features = np.array(
-                    current_lags
-                    + [current_vibration, current_csn]
-                ).reshape(1, -1)
-                forecast_value = model.predict(
-                    input_features
-                )[0]
-                predictions.append(forecast_value)
-                future_date = last_date + timedelta(
-                    days=i + 1
+            digests = [
+                self._upload_digest(name)
+                for name in self.uploaded_file_names
+            ]
+            settings = (
+                self.LAG_FEATURES,
+                self.FORECAST_CYCLES,
+                self.forecast_strategy,
+                self.model_backend,
+            )
+            limit = self.margin_limit
+        try:
+            job = get_executor().submit(
+                session, partition_engines, paths, digests
+            )
+            async with self:
+                self.job_id = job.id
+            tasks = await asyncio.wrap_future(job.future)
+            run = FleetRun(tasks, *settings)
+            _active_fleet_runs[run.run_id] = run
+            async with self:
+                self.job_id = ""
+                self.fleet_run_id = run.run_id
+            runner = asyncio.ensure_future(
+                asyncio.to_thread(
+                    run.run, get_fleet_executor(), session
                 )
-                future_dates.append(future_date)
-                current_lags.pop(0)
-                current_lags.append(forecast_value)
-                current_csn += 1
-            forecast_df = pd.DataFrame(
-                {
-                    "Date": future_dates,
-                    "EGT Margin Forecast (XGBoost)": predictions,
-                }
             )
-            chart_data_list = []
-            for _, row in forecast_df.iterrows():
-                chart_data_list.append(
-                    {
-                        "date": row["Date"].strftime(
-                            "%Y-%m-%d"
-                        ),
-                        "EGT Margin Forecast (XGBoost)": round(
-                            row[
-                                "EGT Margin Forecast (XGBoost)"
-                            ],
-                            2,
-                        ),
-                    }
+            shown = None
+            while not runner.done():
+                progress = run.progress
+                shown = await self._push_progress(
+                    shown,
+                    f"Moteurs traités : {progress.done}/{progress.total}"
+                    f" ({progress.engines_per_min:.1f} moteurs/min)",
+                    Progress(
+                        "",
+                        progress.done + progress.failed,
+                        progress.total,
+                        progress.eta_seconds,
+                    ),
+                )
+                await asyncio.wait(
+                    {runner}, timeout=JOB_POLL_SECONDS
                 )
+            await runner
+            executor = get_executor()
+            job = executor.submit(
+                session,
+                screen_fleet,
+                run.tasks,
+                run.n_lags,
+                limit,
+                LIMIT_MAX_CYCLES,
+                run.backend,
+            )
             async with self:
-                self.forecast_chart_data = chart_data_list
-                self.raw_forecast_df_json = (
-                    forecast_df.to_json(
-                        orient="records", date_format="iso"
-                    )
+                self.job_id = job.id
+            await self._follow_job(
+                executor, job, "Classement de la flotte..."
+            )
+            ranking = await asyncio.wrap_future(job.future)
+            summary = run.summary().merge(
+                ranking.rename(
+                    columns={
+                        "Engine": "engine",
+                        "Source": "source",
+                        CYCLES_COLUMN: "cycles_to_limit",
+                        LIMIT_DATE_COLUMN: "limit_date",
+                    }
+                ),
+                on=["engine", "source"],
+                how="left",
+            )
+            store = get_artifact_store()
+            artifact_id = await asyncio.to_thread(
+                lambda: store.put(run.combined())
+            )
+            # Spreadsheets have no infinity: engines that stay above
+            # the limit get a blank cell.
+            ranking_id = await asyncio.to_thread(
+                store.put,
+                ranking.replace(np.inf, np.nan),
+            )
+            records = summary.to_dict("records")
+            async with self:
+                self._fleet_records = records
+                self.fleet_summary = _fleet_rows(
+                    records,
+                    self.fleet_sort_key,
+                    self.fleet_sort_desc,
                 )
-                self.show_chart = True
+                self.ranking_artifact_id = ranking_id
+                self.forecast_artifact_id = artifact_id
+                self.status_message = f"Prévision de flotte terminée : {run.progress.done}/{run.progress.total} moteurs."
+                if run.progress.failed:
+                    self.status_message += (
+                        f" {run.progress.failed} en échec."
+                    )
+        except JobCancelled:
+            async with self:
+                self.status_message = "Prévision annulée."
+        except JobRejected as e:
+            async with self:
+                self.error_message = str(e)
                 self.status_message = (
-                    "Prévision terminée avec succès."
+                    "Échec de la prévision."
                 )
-                self.error_message = None
-                if not XGBOOST_AVAILABLE:
-                    self.status_message += " (Utilisation d'un modèle factice car XGBoost n'est pas installé)."
-        except FileNotFoundError:
+        except FileNotFoundError as e:
             async with self:
-                self.error_message = f"Fichier '{self.uploaded_file_name}' non trouvé. Veuillez le télécharger à nouveau."
+                self.error_message = f"Fichier '{e.filename}' non trouvé. Veuillez le télécharger à nouveau."
                 self.status_message = (
                     "Échec de la prévision."
                 )
@@ -235,54 +528,313 @@ class ForecastState(rx.State):
                 )
         finally:
             async with self:
+                _active_fleet_runs.pop(
+                    self.fleet_run_id, None
+                )
                 self.is_processing = False
+                self.job_id = ""
+                self.progress_percent = -1
+                self.progress_label = ""
+                self.fleet_run_id = ""
+
+    @rx.event(background=True)
+    async def zoom_chart(self):
+        async with self:
+            if self.fleet_mode:
+                return
+            file_path = self._upload_path(
+                self.uploaded_file_name
+            )
+            artifact_id = self.forecast_artifact_id
+            budget = self.CHART_POINTS
+            start, end = self.chart_start, self.chart_end
+            limit = self.margin_limit
+            columns = forecast_columns(self.forecast_model)
+        forecast_df = get_artifact_store().get(artifact_id)
+        if forecast_df is None:
+            return
+        forecast_df = forecast_df.set_index("Date").rename(
+            columns={
+                column: key
+                for key, column in columns.items()
+            }
+        )
+        forecast = forecast_df[FORECAST_KEY]
+        bands = (
+            forecast_df[[LOWER_KEY, UPPER_KEY]]
+            if LOWER_KEY in forecast_df.columns
+            else None
+        )
+        chart_data = await asyncio.to_thread(
+            reload_chart_series,
+            file_path,
+            forecast,
+            budget,
+            start,
+            end,
+            bands,
+            limit,
+        )
+        async with self:
+            self.forecast_chart_data = chart_data
+
+    @rx.event
+    def reset_chart_zoom(self):
+        self.chart_start = ""
+        self.chart_end = ""
+        return ForecastState.zoom_chart
+
+    @rx.event(background=True)
+    async def run_tuning(self):
+        async with self:
+            if not self.uploaded_file_name:
+                self.error_message = "Aucun fichier n'a été téléchargé pour l'optimisation."
+                self.status_message = "Veuillez d'abord télécharger un fichier."
+                return
+            if not BACKENDS[self.model_backend].boosted:
+                self.error_message = "L'optimisation des paramètres nécessite le modèle XGBoost."
+                return
+            self.is_processing = True
+            self.error_message = None
+            self.status_message = (
+                "Préparation de la validation croisée..."
+            )
+            session = self.router.session.client_token
+            request = TuningRequest(
+                self._upload_path(self.uploaded_file_name),
+                digest=self._upload_digest(
+                    self.uploaded_file_name
+                ),
+            )
+        executor = get_executor()
+        try:
+            job = executor.submit(
+                session, run_tuning, request
+            )
+            async with self:
+                self.job_id = job.id
+            await self._follow_job(
+                executor,
+                job,
+                "Préparation de la validation croisée...",
+            )
+            tuned = await asyncio.wrap_future(job.future)
+            async with self:
+                self.status_message = (
+                    f"Optimisation terminée : {tuned.n_lags} lags, "
+                    f"erreur {tuned.score:.2f} °C contre "
+                    f"{tuned.default_score:.2f} °C par défaut. "
+                    "Les prochaines prévisions de ce fichier l'utiliseront."
+                )
+        except JobCancelled:
+            async with self:
+                self.status_message = (
+                    "Optimisation annulée."
+                )
+        except (JobRejected, ValueError) as e:
+            async with self:
+                self.error_message = str(e)
+                self.status_message = (
+                    "Échec de l'optimisation."
+                )
+        except FileNotFoundError:
+            async with self:
+                self.error_message = f"Fichier '{self.uploaded_file_name}' non trouvé. Veuillez le télécharger à nouveau."
+                self.status_message = (
+                    "Échec de l'optimisation."
+                )
+        except KeyError as e:
+            async with self:
+                self.error_message = f"Colonne manquante dans le fichier Excel: {str(e)}. Vérifiez les en-têtes à la ligne 8."
+                self.status_message = (
+                    "Échec de l'optimisation."
+                )
+        except Exception as e:
+            import traceback
+
+            tb_str = traceback.format_exc()
+            async with self:
+                self.error_message = f"Une erreur est survenue: {str(e)}\n{tb_str}"
+                self.status_message = (
+                    "Échec de l'optimisation."
+                )
+        finally:
+            async with self:
+                self.is_processing = False
+                self.job_id = ""
+                self.progress_percent = -1
+                self.progress_label = ""
+
+    @rx.event
+    def cancel_forecast(self):
+        if self.job_id:
+            get_executor().cancel(self.job_id)
+        if self.fleet_run_id in _active_fleet_runs:
+            _active_fleet_runs[self.fleet_run_id].cancel()
+
+    async def _push_progress(
+        self,
+        shown: tuple | None,
+        message: str,
+        progress: Progress | None = None,
+    ) -> tuple:
+        """Send status and progress in one delta, only when they changed."""
+        view = (message, *_progress_view(progress))
+        if view != shown:
+            async with self:
+                (
+                    self.status_message,
+                    self.progress_percent,
+                    self.progress_label,
+                ) = view
+        return view
+
+    async def _follow_job(
+        self, executor, job, default: str
+    ):
+        """Mirror a job's queue position and progress until it ends."""
+        finished = asyncio.wrap_future(job.future)
+        shown = None
+        while not job.done():
+            position = executor.position(job)
+            if position:
+                shown = await self._push_progress(
+                    shown,
+                    f"En file d'attente (position {position})...",
+                )
+            else:
+                shown = await self._push_progress(
+                    shown,
+                    job.stage or default,
+                    job.progress,
+                )
+            await asyncio.wait(
+                {finished}, timeout=JOB_POLL_SECONDS
+            )
+
+    def _upload_path(self, name: str):
+        return get_upload_store().resolve(
+            self.router.session.client_token, name
+        )
+
+    def _upload_digest(self, name: str) -> str | None:
+        return get_upload_store().digest(
+            self.router.session.client_token, name
+        )
+
+    def _discard_forecast(self):
+        for artifact_id in (
+            self.forecast_artifact_id,
+            self.ranking_artifact_id,
+        ):
+            get_artifact_store().discard(artifact_id)
+            get_export_cache().discard(artifact_id)
+        self.forecast_artifact_id = ""
+        self.ranking_artifact_id = ""
 
     @rx.var
     def can_download(self) -> bool:
-        return bool(self.raw_forecast_df_json) and (
+        return bool(self.forecast_artifact_id) and (
             not self.is_processing
         )
 
-    def download_excel(self):
-        if not self.raw_forecast_df_json:
+    @rx.event
+    def sort_fleet(self, key: str):
+        if key == self.fleet_sort_key:
+            self.fleet_sort_desc = not self.fleet_sort_desc
+        else:
+            self.fleet_sort_key = key
+            self.fleet_sort_desc = False
+        self.fleet_summary = _fleet_rows(
+            self._fleet_records,
+            self.fleet_sort_key,
+            self.fleet_sort_desc,
+        )
+
+    @rx.var
+    def forecast_series_name(self) -> str:
+        if not self.forecast_model:
+            return "Prévision EGT"
+        return f"Prévision EGT ({self.forecast_model})"
+
+    @rx.var
+    def risk_zone_label(self) -> str:
+        return f"Zone à Risque (< {self.margin_limit:g}°C)"
+
+    @rx.var
+    def model_backends(self) -> list[dict[str, str]]:
+        return [
+            {"name": name, "label": BACKENDS[name].label}
+            for name in available_backends()
+        ]
+
+    @rx.var
+    def export_formats(self) -> list[str]:
+        return list(available_formats())
+
+    @rx.event(background=True)
+    async def download_forecast(self):
+        async with self:
+            artifact_id = self.forecast_artifact_id
+            fmt = self.export_format
+            if self.fleet_summary:
+                file_name = f"EGT_Margin_Forecast_Fleet_{len(self.fleet_summary)}_Engines_{self.FORECAST_CYCLES}_Cycles.{fmt}"
+            else:
+                file_name = f"EGT_Margin_Forecast_{self.uploaded_file_name.split('.')[0]}_{self.FORECAST_CYCLES}_Cycles.{fmt}"
+        return await self._download_artifact(
+            artifact_id, fmt, file_name
+        )
+
+    @rx.event(background=True)
+    async def download_ranking(self):
+        async with self:
+            artifact_id = self.ranking_artifact_id
+            fmt = self.export_format
+            file_name = f"EGT_Fleet_Ranking_{len(self.fleet_summary)}_Engines_{self.margin_limit:g}C.{fmt}"
+        return await self._download_artifact(
+            artifact_id, fmt, file_name
+        )
+
+    async def _download_artifact(
+        self, artifact_id: str, fmt: str, file_name: str
+    ):
+        store = get_artifact_store()
+        if artifact_id not in store:
             return rx.toast(
                 "Aucune donnée de prévision à télécharger.",
                 duration=3000,
             )
         try:
-            forecast_df = pd.read_json(
-                self.raw_forecast_df_json, orient="records"
-            )
-            if "Date" in forecast_df.columns and (
-                not pd.api.types.is_datetime64_any_dtype(
-                    forecast_df["Date"]
+            recorder = SpanRecorder()
+            with recorder.span("export"):
+                path = await asyncio.to_thread(
+                    get_export_cache().get,
+                    artifact_id,
+                    fmt,
+                    lambda: store.get(artifact_id),
                 )
-            ):
-                forecast_df["Date"] = pd.to_datetime(
-                    forecast_df["Date"]
+            if path is None:
+                return rx.toast(
+                    "Aucune donnée de prévision à télécharger.",
+                    duration=3000,
                 )
-            if "Date" in forecast_df.columns:
-                forecast_df["Date"] = forecast_df[
-                    "Date"
-                ].dt.strftime("%Y-%m-%d")
-            output = io.BytesIO()
-            with pd.ExcelWriter(
-                output, engine="openpyxl"
-            ) as writer:
-                forecast_df.to_excel(
-                    writer,
-                    index=False,
-                    sheet_name="Forecast",
+            with recorder.span("read"):
+                data = await asyncio.to_thread(
+                    path.read_bytes
+                )
+            record_spans("download", recorder.spans)
+            async with self:
+                self.stage_timings = _timing_rows(
+                    recorder.spans
                 )
-            file_name = f"EGT_Margin_Forecast_{self.uploaded_file_name.split('.')[0]}_{self.FORECAST_CYCLES}_Cycles.xlsx"
             return rx.download(
-                data=output.getvalue(), filename=file_name
+                data=data, filename=file_name
             )
         except Exception as e:
-            async_error_message = f"Erreur lors de la création du fichier Excel: {str(e)}"
+            async_error_message = f"Erreur lors de la création du fichier {fmt}: {str(e)}"
             print(async_error_message)
             return rx.toast(
-                f"Erreur Excel: {str(e)}",
+                f"Erreur d'export: {str(e)}",
                 duration=5000,
                 id="excel_error_toast",
             )
\ No newline at end of file
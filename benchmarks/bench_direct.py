@@ -0,0 +1,92 @@
+"""Recursive vs direct multi-horizon forecasting on a held-out tail.
+
+Run with ``python -m benchmarks.bench_direct``.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from xgboost import XGBRegressor
+
+from app.pipeline.direct import DirectForecaster
+from app.pipeline.features import (
+    build_lag_matrix,
+    forecast_seed,
+)
+from app.pipeline.recursive import recursive_forecast
+from app.pipeline.tree_eval import TreeEnsemble
+from benchmarks.synthetic import synthetic_log
+
+
+def make_model(**kwargs):
+    return XGBRegressor(
+        objective="reg:squarederror",
+        n_estimators=100,
+        random_state=42,
+        **kwargs,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--lags", type=int, default=30)
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    df = synthetic_log(args.rows)
+    cut = args.rows - args.steps
+    train = df.iloc[:cut]
+    actual = df["EGT Margin"].to_numpy()[
+        cut : cut + args.steps
+    ]
+    lag_matrix = build_lag_matrix(train, args.lags)
+    seed = forecast_seed(train, args.lags)
+
+    start = time.perf_counter()
+    model = make_model()
+    model.fit(lag_matrix.X, lag_matrix.y)
+    recursive_fit = time.perf_counter() - start
+    start = time.perf_counter()
+    ensemble = TreeEnsemble.from_model(model)
+    recursive = recursive_forecast(
+        ensemble.predict, seed, args.lags, args.steps
+    )[0]
+    recursive_predict = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forecaster = DirectForecaster.fit(
+        make_model, train, lag_matrix, args.steps
+    )
+    direct_fit = time.perf_counter() - start
+    start = time.perf_counter()
+    direct = forecaster.predict(seed, args.steps)[0]
+    direct_predict = time.perf_counter() - start
+
+    print(
+        f"{'strategy':<10} {'fit s':>8} {'predict ms':>11}"
+        f" {'MAE':>7} {'RMSE':>7}"
+    )
+    for name, fit_s, predict_s, forecast in (
+        (
+            "recursive",
+            recursive_fit,
+            recursive_predict,
+            recursive,
+        ),
+        ("direct", direct_fit, direct_predict, direct),
+    ):
+        error = forecast - actual
+        print(
+            f"{name:<10} {fit_s:8.2f} {predict_s * 1000:11.2f}"
+            f" {np.abs(error).mean():7.3f}"
+            f" {np.sqrt((error**2).mean()):7.3f}"
+        )
+    print(
+        f"direct horizons: {forecaster.horizons.tolist()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""Time every forecasting stage on synthetic workbooks of several sizes.
+
+Run with ``python -m benchmarks.bench_pipeline --rows 1000 10000 100000``;
+training, forecasting and fleet screening are timed once per model
+backend (``--backends``, every installed one by default). Add ``--output run.json`` to keep the results. Passing a previous
+file as ``--baseline`` flags stages that got slower than ``--tolerance``
+and makes the command exit with status 1.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.backends import (
+    available_backends,
+    get_backend,
+)
+from app.pipeline.chart_series import build_chart_series
+from app.pipeline.exports import (
+    available_formats,
+    write_export,
+)
+from app.pipeline.features import (
+    TARGET_COLUMN,
+    build_lag_matrix,
+)
+from app.pipeline.ingest import stream_flight_log
+from app.pipeline.parse_cache import ParseCache
+from app.pipeline.recursive import (
+    cycles_to_limit,
+    recursive_forecast,
+)
+from app.pipeline.uploads import UploadStore
+from benchmarks.synthetic import write_workbook
+
+DEFAULT_ROWS = [1000, 10000, 100000]
+# Differences below this are timer noise on sub-millisecond stages.
+MIN_REGRESSION_SECONDS = 0.005
+PACKAGES = (
+    "numpy",
+    "pandas",
+    "openpyxl",
+    "pyarrow",
+    "xgboost",
+    "reflex",
+)
+
+
+def environment() -> dict:
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def timed(fn, repeat: int):
+    """Best wall time of ``repeat`` calls and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+class _Upload:
+    """The part of Reflex's UploadFile that ``UploadStore.save`` reads."""
+
+    def __init__(self, name: str, file):
+        self.name = name
+        self._file = file
+
+    async def read(self, size: int) -> bytes:
+        return self._file.read(size)
+
+
+def bench_size(
+    rows: int,
+    workdir: Path,
+    n_lags: int,
+    n_steps: int,
+    repeat: int,
+    backends: list[str],
+    engines: int,
+) -> dict[str, float]:
+    source = workdir / f"flights-{rows}.xlsx"
+    if not source.exists():
+        write_workbook(source, rows)
+    store = UploadStore(workdir / "uploads")
+    seconds = {}
+
+    def upload():
+        # What handle_upload does with the browser's file.
+        with open(source, "rb") as file:
+            return asyncio.run(
+                store.save(
+                    "bench", _Upload(source.name, file)
+                )
+            )
+
+    seconds["upload"], uploaded = timed(upload, repeat)
+    seconds["parse"], (df, _) = timed(
+        lambda: stream_flight_log(uploaded),
+        repeat,
+    )
+    (workdir / "parsed").mkdir(exist_ok=True)
+    cache = ParseCache(workdir / "parsed")
+    cache.put("bench", df)
+    seconds["parse_cached"], _ = timed(
+        lambda: cache.get("bench"), repeat
+    )
+    seconds["lag_features"], lag_matrix = timed(
+        lambda: build_lag_matrix(df, n_lags), repeat
+    )
+
+    predictions = None
+    for name in backends:
+        backend = get_backend(name)
+        build_model = backend.builder(backend.params())
+
+        def train():
+            model = build_model()
+            model.fit(lag_matrix.X, lag_matrix.y)
+            return model
+
+        seconds[f"train_{name}"], model = timed(
+            train, repeat
+        )
+        predict = backend.predictor(model)
+        seconds[f"forecast_{name}"], predictions = timed(
+            lambda: recursive_forecast(
+                predict, lag_matrix.X[-1], n_lags, n_steps
+            )[0],
+            repeat,
+        )
+        # A fleet of ``engines`` copies of the model seeded from the
+        # last lag rows; an unreachable limit runs the full cap.
+        seeds = lag_matrix.X[-engines:]
+        fleet_predict = backend.member_predictor(
+            [model] * len(seeds)
+        )
+        seconds[f"screen_{name}"], _ = timed(
+            lambda: cycles_to_limit(
+                fleet_predict,
+                seeds,
+                n_lags,
+                -np.inf,
+                n_steps,
+            ),
+            repeat,
+        )
+    dates = lag_matrix.index[-1] + pd.to_timedelta(
+        np.arange(1, n_steps + 1), unit="D"
+    )
+    seconds["chart"], _ = timed(
+        lambda: build_chart_series(
+            df[TARGET_COLUMN],
+            pd.Series(predictions, index=dates),
+        ),
+        repeat,
+    )
+    forecast_df = pd.DataFrame(
+        {
+            "Date": dates,
+            "EGT Margin Forecast": predictions,
+        }
+    )
+    for fmt in available_formats():
+        target = workdir / f"forecast.{fmt}"
+        seconds[f"export_{fmt}"], _ = timed(
+            lambda: write_export(forecast_df, target, fmt),
+            repeat,
+        )
+    return seconds
+
+
+def compare(
+    results: list[dict],
+    baseline: list[dict],
+    tolerance: float,
+) -> list[dict]:
+    """Stages slower than the baseline by more than ``tolerance``."""
+    previous = {
+        (entry["rows"], entry["stage"]): entry["seconds"]
+        for entry in baseline
+    }
+    regressions = []
+    for entry in results:
+        before = previous.get(
+            (entry["rows"], entry["stage"])
+        )
+        if (
+            before
+            and entry["seconds"] > before * (1 + tolerance)
+            and entry["seconds"] - before
+            > MIN_REGRESSION_SECONDS
+        ):
+            regressions.append(
+                {**entry, "baseline_seconds": before}
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=DEFAULT_ROWS
+    )
+    parser.add_argument("--lags", type=int, default=30)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=available_backends(),
+        help="Model backends to time.",
+    )
+    parser.add_argument(
+        "--engines",
+        type=int,
+        default=50,
+        help="Fleet size for the screening stage.",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=Path,
+        help="Keep generated workbooks here between runs.",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown before flagging, as a fraction.",
+    )
+    args = parser.parse_args()
+
+    workdir = args.workdir or Path(
+        tempfile.mkdtemp(prefix="egt-bench-")
+    )
+    workdir.mkdir(parents=True, exist_ok=True)
+    results = []
+    try:
+        for rows in args.rows:
+            seconds = bench_size(
+                rows,
+                workdir,
+                args.lags,
+                args.steps,
+                args.repeat,
+                args.backends,
+                args.engines,
+            )
+            for stage, value in seconds.items():
+                results.append(
+                    {
+                        "rows": rows,
+                        "stage": stage,
+                        "seconds": value,
+                    }
+                )
+                print(
+                    f"{rows:>9} {stage:<18} {value * 1000:12.2f} ms"
+                )
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "environment": environment(),
+        "settings": {
+            "lags": args.lags,
+            "steps": args.steps,
+            "repeat": args.repeat,
+            "backends": args.backends,
+            "engines": args.engines,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(
+            results, baseline["results"], args.tolerance
+        )
+        for entry in regressions:
+            print(
+                f"REGRESSION {entry['rows']} {entry['stage']}: "
+                f"{entry['baseline_seconds'] * 1000:.2f} ms -> "
+                f"{entry['seconds'] * 1000:.2f} ms"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
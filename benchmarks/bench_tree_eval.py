@@ -0,0 +1,88 @@
+"""Per-step latency of the recursive forecast: XGBoost vs TreeEnsemble.
+
+Run with ``python -m benchmarks.bench_tree_eval``.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from xgboost import XGBRegressor
+
+from app.pipeline.features import build_lag_matrix
+from app.pipeline.recursive import recursive_forecast
+from app.pipeline.tree_eval import TreeEnsemble
+from benchmarks.synthetic import synthetic_log
+
+
+def time_per_step(predict, seed, n_lags, steps, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        recursive_forecast(predict, seed, n_lags, steps)
+        best = min(best, time.perf_counter() - start)
+    return best / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--lags", type=int, default=30)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lag_matrix = build_lag_matrix(
+        synthetic_log(args.rows), args.lags
+    )
+    model = XGBRegressor(
+        objective="reg:squarederror",
+        n_estimators=args.trees,
+        random_state=42,
+    )
+    model.fit(lag_matrix.X, lag_matrix.y)
+    start = time.perf_counter()
+    ensemble = TreeEnsemble.from_model(model)
+    export_ms = (time.perf_counter() - start) * 1000
+    seed = lag_matrix.X[-1]
+
+    reference = recursive_forecast(
+        model.predict, seed, args.lags, args.steps
+    )
+    fast = recursive_forecast(
+        ensemble.predict, seed, args.lags, args.steps
+    )
+    xgb_step = time_per_step(
+        model.predict,
+        seed,
+        args.lags,
+        args.steps,
+        args.repeat,
+    )
+    fast_step = time_per_step(
+        ensemble.predict,
+        seed,
+        args.lags,
+        args.steps,
+        args.repeat,
+    )
+    print(f"trees={args.trees} depth={ensemble.depth}")
+    print(f"export:               {export_ms:8.2f} ms")
+    print(
+        f"XGBRegressor.predict: {xgb_step * 1e6:8.1f} us/step"
+    )
+    print(
+        f"TreeEnsemble.predict: {fast_step * 1e6:8.1f} us/step"
+    )
+    print(
+        f"speedup:              {xgb_step / fast_step:8.1f}x"
+    )
+    print(
+        "max abs diff:         "
+        f"{np.abs(reference - fast).max():8.2e}"
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
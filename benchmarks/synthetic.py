@@ -0,0 +1,149 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.ingest import (
+    DATE_COLUMN,
+    HEADER_ROW,
+    VALUE_COLUMNS,
+)
+
+WRITE_CHUNK_ROWS = 50000
+
+
+def synthetic_log(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Degrading EGT margin with noise, indexed like a parsed log."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "EGT Margin": 60
+            - np.linspace(0, 30, rows)
+            + rng.normal(0, 1.5, rows),
+            "Vibration of the core": rng.normal(
+                1, 0.1, rows
+            ),
+            "CSN": np.arange(rows) + 1000,
+        },
+        index=pd.date_range(
+            "2020-01-01", periods=rows, freq="D"
+        ),
+    )
+
+
+def synthetic_flights(
+    rows: int, seed: int = 0, missing_rate: float = 0.002
+) -> pd.DataFrame:
+    """Flight-by-flight log with the columns of a real export.
+
+    Two to four flights a day, a margin that deteriorates with cycles
+    and partly recovers at each engine wash, vibration that drifts up
+    with wear, and a few blank sensor readings.
+    """
+    rng = np.random.default_rng(seed)
+    gaps = rng.gamma(3.0, 8 / 3.0, rows)
+    dates = pd.Timestamp("2015-01-01") + pd.to_timedelta(
+        np.cumsum(gaps).round(0), unit="h"
+    )
+    cycles = np.arange(rows)
+    wash_every = max(rows // 8, 50)
+    since_wash = cycles % wash_every
+    wear = 35 * cycles / max(rows - 1, 1)
+    egt = (
+        65
+        - wear
+        - 4 * since_wash / wash_every
+        + rng.normal(0, 1.2, rows)
+    )
+    vibration = (
+        0.8 + 0.01 * wear + rng.gamma(4.0, 0.025, rows)
+    )
+    df = pd.DataFrame(
+        {
+            DATE_COLUMN: dates,
+            "EGT Margin": egt.round(2),
+            "Vibration of the core": vibration.round(3),
+            "CSN": cycles + 1200,
+        }
+    )
+    for column in ("EGT Margin", "Vibration of the core"):
+        df.loc[rng.random(rows) < missing_rate, column] = (
+            np.nan
+        )
+    return df
+
+
+def write_workbook(
+    path: Path,
+    rows: int,
+    seed: int = 0,
+    engines: int = 1,
+) -> Path:
+    """Write a synthetic flight log laid out like a customer export.
+
+    ``HEADER_ROW`` preamble lines precede the header; with several
+    ``engines`` an ``Engine Serial`` column interleaves their flights.
+    """
+    from openpyxl import Workbook
+
+    frames = []
+    for engine in range(engines):
+        frame = synthetic_flights(
+            -(-rows // engines), seed + engine
+        )
+        if engines > 1:
+            frame.insert(
+                1, "Engine Serial", f"ESN-{engine:03d}"
+            )
+        frames.append(frame)
+    df = (
+        pd.concat(frames)
+        .sort_values(DATE_COLUMN, kind="stable")
+        .iloc[:rows]
+    )
+    df["Flight Number"] = [
+        f"FL{n % 9000 + 100}" for n in range(len(df))
+    ]
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Flight Data")
+    sheet.append(["EGT Margin Trend Report"])
+    sheet.append(["Generated for benchmarking", seed])
+    for _ in range(HEADER_ROW - 2):
+        sheet.append([])
+    sheet.append(list(df.columns))
+    dates = df[DATE_COLUMN].dt.to_pydatetime()
+    for start in range(0, len(df), WRITE_CHUNK_ROWS):
+        chunk = df.iloc[start : start + WRITE_CHUNK_ROWS]
+        values = chunk.drop(columns=DATE_COLUMN)
+        values = values.astype(object).where(
+            values.notna(), None
+        )
+        for date, row in zip(
+            dates[start : start + WRITE_CHUNK_ROWS],
+            values.itertuples(index=False, name=None),
+        ):
+            sheet.append((date, *row))
+    path = Path(path)
+    workbook.save(path)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic flight-log workbook."
+    )
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--engines", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_workbook(
+        args.path, args.rows, args.seed, args.engines
+    )
+    print(
+        f"{args.path}: {args.rows} rows, "
+        f"{len(VALUE_COLUMNS)} value columns"
+    )
\ No newline at end of file
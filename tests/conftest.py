@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.pipeline.ingest import (
+    FLIGHT_LOG_COLUMNS,
+    HEADER_ROW,
+)
+
+
+@pytest.fixture(scope="session")
+def flight_log_workbook(tmp_path_factory):
+    """A small export laid out like the real ones.
+
+    Preamble rows above the header, flights out of date order, a blank
+    row, a missing EGT reading and integer CSN counts.
+    """
+    from openpyxl import Workbook
+
+    rng = np.random.default_rng(0)
+    n_rows = 300
+    start = datetime(2020, 1, 1, 6)
+    order = rng.permutation(n_rows)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Flight log export"])
+    for _ in range(HEADER_ROW - 1):
+        sheet.append([])
+    sheet.append(FLIGHT_LOG_COLUMNS)
+    for i, flight in enumerate(order):
+        if i == 40:
+            sheet.append([])
+        sheet.append(
+            [
+                start + timedelta(hours=8 * int(flight)),
+                (
+                    None
+                    if i == 75
+                    else float(60 - 0.05 * flight)
+                    + float(rng.normal(0, 1))
+                ),
+                float(rng.normal(1, 0.1)),
+                1000 + int(flight),
+            ]
+        )
+    path = tmp_path_factory.mktemp("logs") / "engine.xlsx"
+    workbook.save(path)
+    return path
\ No newline at end of file
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from app.pipeline.features import (
+    EXOGENOUS_COLUMNS,
+    TARGET_COLUMN,
+    build_lag_matrix,
+    feature_names,
+    forecast_seed,
+)
+from app.pipeline.ingest import stream_flight_log
+
+
+def _shift_lag_matrix(df: pd.DataFrame, n_lags: int):
+    """The per-column ``shift``/``dropna`` construction it replaced."""
+    features = pd.DataFrame(
+        {
+            f"lag_{i}": df[TARGET_COLUMN].shift(i)
+            for i in range(1, n_lags + 1)
+        },
+        index=df.index,
+    )
+    features[EXOGENOUS_COLUMNS] = df[EXOGENOUS_COLUMNS]
+    features["y"] = df[TARGET_COLUMN]
+    return features.dropna()
+
+
+def test_lag_matrix_matches_shift_construction(
+    flight_log_workbook,
+):
+    df, _ = stream_flight_log(flight_log_workbook)
+    n_lags = 30
+    matrix = build_lag_matrix(df, n_lags)
+    expected = _shift_lag_matrix(df, n_lags)
+    assert len(matrix) == len(expected)
+    assert (matrix.index == expected.index).all()
+    np.testing.assert_array_equal(
+        matrix.X,
+        expected[feature_names(n_lags)]
+        .to_numpy()
+        .astype(np.float32),
+    )
+    np.testing.assert_array_equal(
+        matrix.y, expected["y"].to_numpy(np.float32)
+    )
+
+
+def test_forecast_seed_is_the_next_lag_row():
+    df = pd.DataFrame(
+        {
+            TARGET_COLUMN: np.arange(10, 20, dtype=float),
+            "Vibration of the core": np.linspace(1, 2, 10),
+            "CSN": np.arange(500, 510),
+        },
+        index=pd.date_range("2020-01-01", periods=10),
+    )
+    # The row the lag matrix builds for the last cycle, from the
+    # cycles before it.
+    expected = build_lag_matrix(df, 4).X[-1]
+    seed = forecast_seed(df.iloc[:-1], 4)
+    np.testing.assert_array_equal(
+        seed[:4], [18, 17, 16, 15]
+    )
+    np.testing.assert_array_equal(seed[:4], expected[:4])
+    assert seed[-1] == expected[-1] == 509
\ No newline at end of file
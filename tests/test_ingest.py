@@ -0,0 +1,41 @@
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from app.pipeline.ingest import (
+    VALUE_COLUMNS,
+    read_flight_log,
+    stream_flight_log,
+)
+
+
+def test_stream_matches_read_excel(flight_log_workbook):
+    streamed, stats = stream_flight_log(flight_log_workbook)
+    expected = read_flight_log(flight_log_workbook)[
+        VALUE_COLUMNS
+    ]
+    assert stats.rows == len(expected) == 300
+    # Blank rows make read_excel load integer columns as floats.
+    assert streamed["CSN"].dtype == "int64"
+    pd.testing.assert_frame_equal(
+        streamed, expected, check_dtype=False
+    )
+
+
+def test_stream_projects_columns(flight_log_workbook):
+    streamed, _ = stream_flight_log(
+        flight_log_workbook, columns=["EGT Margin"]
+    )
+    expected = read_flight_log(flight_log_workbook)[
+        ["EGT Margin"]
+    ]
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_measure_memory_stops_tracing_on_error(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        stream_flight_log(
+            tmp_path / "missing.xlsx", measure_memory=True
+        )
+    assert not tracemalloc.is_tracing()
\ No newline at end of file
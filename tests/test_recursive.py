@@ -0,0 +1,64 @@
+import numpy as np
+
+from app.pipeline.recursive import (
+    LagRing,
+    cycles_to_limit,
+    recursive_forecast,
+)
+
+
+def _reference_forecast(predict, seed, n_lags, n_steps):
+    """Shift-the-lags recursion the ring buffer must reproduce."""
+    row = np.array(seed, np.float32)
+    out = []
+    for _ in range(n_steps):
+        value = predict(row[None, :])[0]
+        out.append(value)
+        row[1:n_lags] = row[: n_lags - 1].copy()
+        row[0] = value
+        row[-1] += 1.0
+    return np.array(out, np.float32)
+
+
+def test_push_makes_the_new_value_lag_1():
+    ring = LagRing(np.array([1, 2, 3, 9], np.float32), 3)
+    ring.push(np.array([0], np.float32))
+    np.testing.assert_array_equal(
+        ring.rows[0], [0, 1, 2, 9]
+    )
+    ring.push(np.array([-1], np.float32))
+    np.testing.assert_array_equal(
+        ring.rows[0], [-1, 0, 1, 9]
+    )
+
+
+def test_recursive_forecast_matches_reference():
+    rng = np.random.default_rng(0)
+    n_lags = 5
+    weights = 0.3 * rng.normal(size=n_lags + 2)
+    weights = weights.astype(np.float32)
+    seed = rng.normal(size=n_lags + 2)
+
+    def predict(rows):
+        return rows @ weights
+
+    np.testing.assert_allclose(
+        recursive_forecast(predict, seed, n_lags, 20)[0],
+        _reference_forecast(predict, seed, n_lags, 20),
+        rtol=1e-5,
+    )
+
+
+def test_cycles_to_limit_follows_lag_1():
+    # Each cycle loses one degree from the latest margin, so only the
+    # lag_1 feedback decides when each series crosses.
+    seeds = np.array(
+        [[10, 0, 0, 0], [7, 50, 50, 0], [30, 0, 0, 0]],
+        np.float32,
+    )
+
+    def predict(rows, active):
+        return rows[:, 0] - 1
+
+    cycles = cycles_to_limit(predict, seeds, 3, 5.0, 10)
+    np.testing.assert_array_equal(cycles, [5, 2, np.inf])
\ No newline at end of file
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from app.pipeline.features import build_lag_matrix
+from app.pipeline.ingest import stream_flight_log
+from app.pipeline.tree_eval import TreeEnsemble
+
+pytest.importorskip("xgboost")
+
+
+def test_tree_ensemble_matches_xgboost(flight_log_workbook):
+    from app.pipeline.model import make_model
+
+    df, _ = stream_flight_log(flight_log_workbook)
+    matrix = build_lag_matrix(df, 10)
+    model = make_model(n_estimators=30)
+    model.fit(matrix.X, matrix.y)
+    rows = matrix.X[-20:].copy()
+    # Missing values take each split's default direction.
+    rows[::3, 0] = np.nan
+    np.testing.assert_allclose(
+        TreeEnsemble.from_model(model).predict(rows),
+        model.predict(rows),
+        rtol=1e-5,
+        atol=1e-5,
+    )
\ No newline at end of file